@@ -0,0 +1,304 @@
+"""
+Benchmark suite for the control loop and astronomy paths, results written as JSON.
+
+Cases:
+  transport   ROTCTLD round trips (single and pipelined) against the simulator, and ROTCTL
+              through pexpect + 'rotctl -m 2' on the same server when rotctl is installed
+  parse_pos   get_pos answer decoding per poll, from the raw rotctl output: the former path
+              (plain answer stripped and split by ROTCTL.send and tools.parse_pos) against
+              hamlib.parse_pos_block (what ROTCTL.get_pos now does), parse_block then
+              parse_pos (rotctld, async), and tools.parse_pos on text and on a Position
+  solar_scan  solar_scan.get_precise_sun and generate_float_scan
+  feed        get_noaa.parse_feed and Track lookups on bench_data/n2yo_sample.json
+              (synthetic payload in the n2yo instant-tracking format)
+  tracking    RMS / max pointing error against a moving target vs command rate (simulator)
+  locator     locator.py batch conversions (grid squares, QRB over a contact log)
+  tle_store   TLEStore on a synthetic catalogue: parsing the TLE file vs loading the .npz cache,
+              lookups by NORAD ID and by name, first EarthSatellite construction
+  startup     cold start of the control core import and of 'python -m rotctl_cc.cli --sim goto --no-wait' (fresh
+              interpreters), against STARTUP_BUDGET_S, and heavy modules pulled in by the core
+
+Cases whose dependencies are missing are reported as skipped.
+
+python bench.py [--cases transport feed ...] [--out bench_results.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from rotctl_cc.rotctl import ROTCTL, tools
+from rotctl_cc.simulator import SimRotator, SimRotctld
+from rotctl_cc.rotctld import ROTCTLD
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Cold start budget of a tracking command, seconds
+STARTUP_BUDGET_S = 0.5
+HEAVY_MODULES = ("numpy", "skyfield", "requests", "matplotlib", "tkinter")
+
+
+def rate(fn, n):
+    """
+    Calls per second of fn() over n calls.
+    """
+    start = time.perf_counter()
+    for i in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+
+def bench_transport(n=2000):
+    server = SimRotctld()
+    rot = ROTCTLD("127.0.0.1", server.port)
+    out = {"rotctld_cmd_per_s": rate(lambda: rot.send("p"), n)}
+    batch = ["p"] * 50
+    out["rotctld_pipelined_cmd_per_s"] = rate(lambda: rot.send_many(batch), n // 50) * 50
+    rot.exit()
+
+    if shutil.which("rotctl"):
+        rot = ROTCTL(model=2, device=f"127.0.0.1:{server.port}")
+        out["pexpect_cmd_per_s"] = rate(lambda: rot.send("p"), n)
+        rot.exit()
+    server.shutdown()
+    return out
+
+
+def _former_poll(before):
+    # ROTCTL.send + tools.parse_pos before hamlib.py (echoed command, plain answer), kept as the baseline
+    out = before.strip()
+    if out.startswith("p"):
+        out = out[1:].strip()
+    data = out.split("\r\n")
+    return float(data[0].split(" ")[-1]), float(data[1].split(" ")[-1])
+
+
+def bench_parse_pos(n=200000):
+    from rotctl_cc import hamlib
+    answer = "Azimuth: 163.000000\r\nElevation: 41.000000"
+    # child.before of one poll, in the former plain mode with echo and in extended mode
+    former = "p\r\nAzimuth: 163.000000\r\nElevation: 41.000000\r\n"
+    block = "get_pos:\r\nAzimuth: 163.000000\r\nElevation: 41.000000\r\nRPRT 0\r\n"
+    values = hamlib.parse_block("p", block)
+    pos = hamlib.parse_pos(values)
+    return {
+        "former_poll_per_s": rate(lambda: _former_poll(former), n),
+        "poll_per_s": rate(lambda: hamlib.parse_pos_block("p", block), n),
+        "block_then_values_per_s": rate(lambda: hamlib.parse_pos(hamlib.parse_block("p", block)), n),
+        "values_per_s": rate(lambda: hamlib.parse_pos(values), n),
+        "text_regex_per_s": rate(lambda: tools.parse_pos(answer), n),
+        "position_passthrough_per_s": rate(lambda: tools.parse_pos(pos), n),
+    }
+
+
+def bench_solar_scan(n=200):
+    import numpy as np
+    from rotctl_cc import solar_scan
+    times = time.time() + np.arange(10000.0)
+    lat, lon = np.array([[48.68], [45.0], [-33.9], [60.2]]), np.array([[2.13], [5.0], [18.4], [24.9]])
+    return {
+        "get_precise_sun_per_s": rate(lambda: solar_scan.get_precise_sun(48.68333, 2.13333), n * 50),
+        "sun_10000x4_observers_ms": 1000 / rate(lambda: solar_scan.get_sun_positions(times, lat, lon), n // 10),
+        "scan_4x4_0.25_ms": 1000 / rate(lambda: solar_scan.generate_float_scan(48.68333, 2.13333, span=4.0, step=0.25), n),
+        "scan_10x10_0.1_ms": 1000 / rate(lambda: solar_scan.generate_float_scan(48.68333, 2.13333, span=10.0, step=0.1), n // 10),
+    }
+
+
+def bench_feed(n=2000):
+    import numpy as np
+    from rotctl_cc.get_noaa import Track, parse_feed
+    with open(os.path.join(HERE, "bench_data", "n2yo_sample.json")) as f:
+        payload = json.load(f)
+    track = Track(parse_feed(payload))
+    times = np.linspace(track.t[0], track.t[-1], 1000)
+    return {
+        "parse_ms": 1000 / rate(lambda: parse_feed(payload), n // 10),
+        "lookup_per_s": rate(lambda: track.at(times[500]), n),
+        "batch_1000_linear_ms": 1000 / rate(lambda: track.at(times), n // 10),
+        "batch_1000_spline_ms": 1000 / rate(lambda: track.at(times, "spline"), n // 10),
+    }
+
+
+def _track(hz, duration, results):
+    # Target sweeping azimuth at 3 deg/s with a slow elevation swing
+    target = lambda t: (100 + 3 * t, 30 + 10 * math.sin(t / 5))
+    server = SimRotctld(SimRotator(az_rate=6.0, el_rate=6.0, accel=12.0))
+    rot = ROTCTLD("127.0.0.1", server.port)
+    server.rotator.az.pos, server.rotator.el.pos = target(0)
+
+    start = time.monotonic()
+    next_cmd = start
+    errors, sent = [], 0
+    while True:
+        now = time.monotonic() - start
+        if now >= duration:
+            break
+        if time.monotonic() >= next_cmd:
+            rot.send("P {:.2f} {:.2f}".format(*target(now)))
+            sent += 1
+            next_cmd += 1 / hz
+        az, el = server.rotator.get_pos()
+        t_az, t_el = target(time.monotonic() - start)
+        errors.append(tools.dist4tuple((az, el), (t_az, t_el)))
+        time.sleep(0.02)
+
+    rot.exit()
+    server.shutdown()
+    results[f"{hz}Hz"] = {
+        "commands": sent,
+        "rms_error_deg": math.sqrt(sum(e * e for e in errors) / len(errors)),
+        "max_error_deg": max(errors),
+    }
+
+
+def bench_tracking(duration=5.0, rates=(0.2, 0.5, 1, 2, 5)):
+    results = {}
+    threads = [threading.Thread(target=_track, args=(hz, duration, results)) for hz in rates]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    return results
+
+
+def bench_locator(n=20, size=10000):
+    import numpy as np
+    from rotctl_cc import locator
+    rng = np.random.default_rng(0)
+    lon, lat = rng.uniform(-180, 180, size), rng.uniform(-90, 90, size)
+    locs = locator.lonlat2loc(lon, lat, 6)
+    us = lambda fn: 1e6 / (rate(fn, n) * size)
+    return {
+        "lonlat2loc_us_per_item": us(lambda: locator.lonlat2loc(lon, lat, 6)),
+        "loc2lonlat_us_per_item": us(lambda: locator.loc2lonlat(locs)),
+        "qrb_us_per_item": us(lambda: locator.qrb(2.13, 48.68, lon, lat)),
+        "qrb_scalar_us": 1e6 / rate(lambda: locator.qrb(2.13, 48.68, -74.0, 40.7), n * 100),
+    }
+
+
+def _tle_checksum(line):
+    return str(sum(int(c) if c.isdigit() else c == "-" for c in line[:68]) % 10)
+
+
+def bench_tle_store(size=30000, n=10000):
+    import tempfile
+    from rotctl_cc.tle_store import TLEStore
+    line1 = "1 25544U 98067A   24001.50000000  .00016717  00000-0  10270-3 0  999"
+    line2 = "2 25544  51.6400  10.0000 0002000  90.0000 270.0000 15.50000000    0"
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cache = os.path.join(tmp, "catalogue.txt"), os.path.join(tmp, "catalogue.npz")
+        with open(path, "w") as f:
+            for k in range(size):
+                l1 = f"1 {10000 + k:05d}{line1[7:]}"
+                l2 = f"2 {10000 + k:05d}  {k % 120:6.4f} {k % 360:8.4f}{line2[25:]}"
+                f.write(f"SAT {k}\n{l1}{_tle_checksum(l1)}\n{l2}{_tle_checksum(l2)}\n")
+        start = time.perf_counter()
+        TLEStore.load([path], cache)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        store = TLEStore.load([path], cache)
+        warm = time.perf_counter() - start
+        store.index("SAT 0")
+        start = time.perf_counter()
+        store.satellite(10000 + size // 2)
+        first = time.perf_counter() - start
+        return {
+            "objects": len(store),
+            "parse_s": cold,
+            "cache_load_s": warm,
+            "lookup_norad_us": 1e6 / rate(lambda: store.index(10000 + size // 2), n),
+            "lookup_name_us": 1e6 / rate(lambda: store.index(f"SAT {size // 2}"), n),
+            "first_satellite_s": first,
+        }
+
+
+def _cold(args, n):
+    # Median wall time of n fresh interpreters
+    times = []
+    for i in range(n):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=HERE, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[n // 2]
+
+
+def bench_startup(n=5):
+    probe = "import sys, rotctl_cc.rotctl, rotctl_cc.rotctld, rotctl_cc.pool, rotctl_cc.cli; print(' '.join(m for m in %r if m in sys.modules))"
+    loaded = subprocess.check_output([sys.executable, "-c", probe % (HEAVY_MODULES,)], cwd=HERE, text=True)
+    goto = _cold(["-m", "rotctl_cc.cli", "--sim", "goto", "10", "5", "--no-wait"], n)
+    return {
+        "interpreter_s": _cold(["-c", "pass"], n),
+        "import_core_s": _cold(["-c", "import rotctl_cc.rotctl, rotctl_cc.rotctld, rotctl_cc.pool"], n),
+        "cli_goto_s": goto,
+        "budget_s": STARTUP_BUDGET_S,
+        "within_budget": goto <= STARTUP_BUDGET_S,
+        "heavy_modules_loaded": loaded.split(),
+    }
+
+
+CASES = {
+    "transport": bench_transport,
+    "parse_pos": bench_parse_pos,
+    "solar_scan": bench_solar_scan,
+    "feed": bench_feed,
+    "tracking": bench_tracking,
+    "locator": bench_locator,
+    "tle_store": bench_tle_store,
+    "startup": bench_startup,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, text=True).strip()
+    except Exception:
+        return None
+
+
+def run(cases):
+    results = {}
+    for name in cases:
+        try:
+            results[name] = CASES[name]()
+        except ImportError as e:
+            results[name] = {"skipped": str(e)}
+        print(f"{name:<12} {json.dumps(results[name])}")
+    return {
+        "revision": git_revision(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(old, new):
+    """
+    Print new / old for every numeric metric present in both runs.
+    """
+    for case, metrics in new["results"].items():
+        for key, value in metrics.items():
+            before = old["results"].get(case, {}).get(key)
+            if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+                print(f"{case}.{key:<32} {before:14.4g} -> {value:14.4g}  x{value / before:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    report = run(args.cases)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
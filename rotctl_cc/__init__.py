@@ -0,0 +1,34 @@
+""" Alexandre Hachet
+
+rotctl-cc : contrôle de rotors d'antenne Hamlib (rotctl, rotctld), suivi de satellites et du soleil.
+
+Les noms principaux sont importables depuis le paquet (from rotctl_cc import ROTCTL) ; chaque
+module n'est chargé qu'au premier accès, pour garder un démarrage léger.
+"""
+
+__version__ = "0.1.0"
+
+# Name -> module of the package that defines it
+_EXPORTS = {
+    "ROTCTL": "rotctl",
+    "tools": "rotctl",
+    "ROTCTLD": "rotctld",
+    "Position": "hamlib",
+    "HamlibError": "hamlib",
+    "RotatorPool": "pool",
+    "open_rotator": "pool",
+    "SupervisedRotator": "supervisor",
+    "AsyncROTCTL": "async_rotctl",
+    "DaemonClient": "daemon",
+    "TrackingDaemon": "daemon",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'rotctl_cc' has no attribute '{name}'")
+    from importlib import import_module
+    return getattr(import_module(f".{module}", __name__), name)
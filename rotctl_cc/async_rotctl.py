@@ -0,0 +1,134 @@
+""" Alexandre Hachet
+
+Interface asyncio pour ROTCTL / ROTCTLD.
+
+Chaque rotor a une file de commandes et une tâche qui la vide : les commandes en attente
+sont envoyées par lots (en pipeline sur rotctld), et les lectures 'p' consécutives
+partagent un seul aller-retour. Les entrées/sorties bloquantes tournent dans un thread
+dédié au rotor, donc des dizaines de suivis peuvent partager la même boucle d'événements.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from . import hamlib
+from .motion import PollSchedule, StallError
+from .rotctl import ROTCTL, tools
+
+
+class AsyncROTCTL:
+
+    def __init__(self, rot, min_interval=0.1, max_interval=2.0, stall_time=5.0):
+        self.rot = rot
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stall_time = stall_time
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rotctl-io")
+        self.queue = None
+        self.worker = None
+        # Batch being sent, failed by close() with the queued commands
+        self.inflight = ()
+
+    async def send(self, command, timeout=3):
+        """
+        Queue a command and wait for its answer. A batch is sent with the shortest timeout of its commands.
+        """
+        if self.worker is None:
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.get_running_loop().create_task(self._run())
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((command, timeout, fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            self.inflight = batch
+
+            # Consecutive reads are answered by a single 'p'
+            commands, index = [], []
+            timeout = min(item[1] for item in batch)
+            for command, _, fut in batch:
+                if not (command == "p" and commands and commands[-1] == "p"):
+                    commands.append(command)
+                index.append(len(commands) - 1)
+            try:
+                results = await loop.run_in_executor(self.executor, self.rot.send_many, commands, timeout)
+            except Exception as e:
+                results = [e] * len(commands)
+
+            for (command, _, fut), i in zip(batch, index):
+                if fut.done():
+                    continue
+                if isinstance(results[i], Exception):
+                    fut.set_exception(results[i])
+                else:
+                    fut.set_result(results[i])
+
+    async def set_pos(self, az, el, timeout=None):
+        """
+        Send 'P az el' and wait until the rotator reaches the position.
+        Raises TimeoutError after 'timeout' seconds and motion.StallError if the rotator stops moving.
+        """
+        a = await self.send(f"P {az} {el}")
+        await self._wait(lambda pos: tools.dist4tuple((az, el), pos), timeout, self.rot.EPS)
+        return a
+
+    async def get_pos(self):
+        # send() joins the value lines of the answer with CRLF
+        return hamlib.parse_pos((await self.send("p")).split("\r\n"))
+
+    async def move(self, dir, speed, step=ROTCTL.EPS, timeout=None):
+        """
+        Move in a direction (ROTCTL.UP/DOWN/LEFT/RIGHT) until the rotator has moved by 'step' degrees.
+        """
+        start_pos = tools.parse_pos(await self.get_pos())
+        a = await self.send(f"M {dir} {speed}")
+        await self._wait(lambda pos: step - tools.dist4tuple(start_pos, pos), timeout, 0)
+        return a
+
+    async def stop(self):
+        return await self.send("S")
+
+    async def park(self):
+        return await self.send("K")
+
+    async def _wait(self, remaining, timeout, eps):
+        schedule = PollSchedule(self.min_interval, self.max_interval, self.stall_time)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                pos = tools.parse_pos(await self.get_pos())
+                now = time.monotonic()
+                left = remaining(pos)
+                if left <= eps:
+                    return pos
+                delay = schedule.update(now, pos, left)
+                if schedule.stalled:
+                    raise StallError(pos, left)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError(f"Rotator did not reach target within {timeout} s")
+                    delay = min(delay, deadline - now)
+                await asyncio.sleep(delay)
+        finally:
+            await self.stop()
+
+    def close(self):
+        """
+        Stop the worker; commands still queued or in flight fail with ConnectionError.
+        """
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        pending = list(self.inflight)
+        self.inflight = ()
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for command, _, fut in pending:
+            if not fut.done():
+                fut.set_exception(ConnectionError(f"AsyncROTCTL closed before '{command}' was answered"))
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,181 @@
+""" Alexandre Hachet
+
+Point d'entrée en ligne de commande (rotctl-cc).
+
+Seuls les modules de contrôle sont chargés au démarrage ; Skyfield, numpy, requests ou
+tkinter ne sont importés que par la sous-commande qui en a besoin.
+
+rotctl-cc [--host H --port P | --model M --device D | --sim] pos|goto|stop|park|follow|tle|gui|daemon|sim
+rotctl-cc --daemon [HOST:]PORT pos|goto|stop|park|follow|tle|gui   (passe par le démon de suivi)
+"""
+
+import argparse
+import sys
+import time
+
+
+def spec_from_args(args):
+    if args.sim:
+        spec = {"sim": {}}
+    elif args.host:
+        spec = {"host": args.host, "port": args.port}
+    else:
+        spec = {"model": args.model, "device": args.device}
+    return dict(spec, supervise=args.supervise)
+
+
+def open_from_args(args):
+    if args.daemon:
+        from .daemon import DEFAULT_PORT, DaemonClient
+        host, _, port = args.daemon.rpartition(":")
+        return DaemonClient(host or "127.0.0.1", int(port or DEFAULT_PORT))
+    from .pool import open_rotator
+    return open_rotator(spec_from_args(args))
+
+
+def cmd_pos(rot, args):
+    from .rotctl import tools
+    pos = rot.get_pos()
+    if pos is False:
+        print(f"No position: {rot.last_error}")
+        return False
+    az, el = tools.parse_pos(pos)
+    print(f"{az:.2f} {el:.2f}")
+
+
+def cmd_goto(rot, args):
+    return rot.set_pos(args.az, args.el, wait=not args.no_wait)
+
+
+def cmd_stop(rot, args):
+    return rot.stop()
+
+
+def cmd_park(rot, args):
+    return rot.park()
+
+
+def cmd_follow(rot, args):
+    if args.daemon:
+        import os
+        print(rot.follow(os.path.abspath(args.file), args.realtime, args.slew_rate)["status"])
+        return
+    from .follow import Follow
+    log = Follow(rot, args.file)._follow_path(realtime=args.realtime, slew_rate=args.slew_rate)
+    print(f"{len(log)} points played")
+
+
+def cmd_tle(rot, args):
+    if args.sat:
+        # Satellite of a catalogue file (TLE or OMM) by NORAD ID or name
+        if args.daemon:
+            print(rot.track_satellite(args.sat, args.period)["status"])
+            return
+        from .tle_follow import track_satellite
+        from .tle_store import TLEStore
+        store = TLEStore.load([args.file])
+        track_satellite(rot, store.satellite(args.sat), store.ts, period=args.period)
+        return
+    if args.file is None:
+        print("A TLE file is required.")
+        return False
+    from .tle_follow import tle_track
+    with open(args.file) as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if args.daemon:
+        print(rot.track_tle(lines[-2], lines[-1], lines[-3] if len(lines) > 2 else None, args.period)["status"])
+        return
+    tle_track(rot, lines[-2], lines[-1], period=args.period)
+
+
+def cmd_gui(rot, args):
+    from .gui import RotatorGUI
+    app = RotatorGUI(rot=rot, refresh=args.refresh)
+    app.protocol("WM_DELETE_WINDOW", app.on_close)
+    app.mainloop()
+
+
+def cmd_daemon(args):
+    import json
+    from .daemon import serve
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    rotators = config.get("rotators") or {"main": spec_from_args(args)}
+    serve(rotators, config.get("observer"), config.get("host", "127.0.0.1"), config.get("port", args.api_port),
+          config.get("tle_files"))
+
+
+def cmd_sim(args):
+    from .simulator import SimRotctld
+    server = SimRotctld(port=args.port, latency=args.latency)
+    print(f"Simulated rotctld listening on 127.0.0.1:{server.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="rotctl-cc", description="Antenna rotator control.")
+    parser.add_argument("--host", help="rotctld host (rotctl over pexpect when omitted)")
+    parser.add_argument("--port", type=int, default=4533)
+    parser.add_argument("--model", type=int, default=1, help="Hamlib rotator model")
+    parser.add_argument("--device", default="/dev/ttyUSB0")
+    parser.add_argument("--sim", action="store_true", help="use a simulated rotator")
+    parser.add_argument("--supervise", action="store_true", help="reconnect automatically when the link drops")
+    parser.add_argument("--daemon", metavar="[HOST:]PORT", help="go through a running tracking daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("pos", help="print the current position").set_defaults(func=cmd_pos)
+    p = sub.add_parser("goto", help="go to a position")
+    p.add_argument("az", type=float)
+    p.add_argument("el", type=float)
+    p.add_argument("--no-wait", action="store_true", help="return without waiting for the rotator")
+    p.set_defaults(func=cmd_goto)
+    sub.add_parser("stop", help="stop the rotator").set_defaults(func=cmd_stop)
+    sub.add_parser("park", help="park the rotator").set_defaults(func=cmd_park)
+    p = sub.add_parser("follow", help="play a trajectory file (text or .trj)")
+    p.add_argument("file")
+    p.add_argument("--realtime", action="store_true", help="timestamps are absolute unix times")
+    p.add_argument("--slew-rate", type=float, help="drop points the rotator cannot reach (deg/s)")
+    p.set_defaults(func=cmd_follow)
+    p = sub.add_parser("tle", help="track a satellite from a TLE file")
+    p.add_argument("file", nargs="?", help="TLE file, or TLE/OMM catalogue with --sat")
+    p.add_argument("--sat", metavar="NORAD|NAME", help="satellite of the catalogue (of the daemon with --daemon)")
+    p.add_argument("--period", type=float, default=1.0)
+    p.set_defaults(func=cmd_tle)
+    p = sub.add_parser("gui", help="open the control window")
+    p.add_argument("--refresh", type=float, default=10.0, help="display refresh rate (Hz)")
+    p.set_defaults(func=cmd_gui)
+    p = sub.add_parser("daemon", help="run the tracking daemon and its local HTTP API")
+    p.add_argument("--config", help='JSON file: {"rotators": {name: spec}, "observer": {"lat", "lon", "elev"}, "port", '
+                                         '"tle_files": [...]}')
+    p.add_argument("--api-port", type=int, default=4540)
+    p = sub.add_parser("sim", help="serve a simulated rotator over the rotctld protocol")
+    p.add_argument("--port", type=int, default=4533)
+    p.add_argument("--latency", type=float, default=0.0)
+    p.set_defaults(func=cmd_sim)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "sim":
+        cmd_sim(args)
+        return 0
+    if args.command == "daemon":
+        cmd_daemon(args)
+        return 0
+    rot = open_from_args(args)
+    try:
+        result = args.func(rot, args)
+    finally:
+        rot.exit()
+    return 1 if result is False else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+""" Alexandre Hachet
+
+Démon de suivi sans interface.
+
+TrackingDaemon possède les connexions aux rotors (RotatorPool) et y fait tourner au plus une
+tâche de suivi par rotor : consigne fixe, satellite à partir d'un TLE, ou fichier de
+trajectoire (Follow). DaemonServer expose une API HTTP JSON locale pour soumettre ces tâches,
+lire position et statistiques, arrêter, ou passer une commande ROTCTL. DaemonClient offre
+l'interface de ROTCTL au-dessus de cette API : l'interface Tk et les scripts partagent ainsi
+une seule connexion au rotor.
+
+GET  /rotators  /position  /stats  /jobs
+POST /target {"az", "el"}  /tle {"line1", "line2"} ou {"satellite": NORAD|nom}  /trajectory {"path"}  /stop  /call {"method", "args"}
+(le champ "rotator" choisit le rotor, le premier par défaut)
+
+rotctl-cc [--sim | --host H | --model M --device D] daemon [--config daemon.json]
+"""
+
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from .hamlib import Position
+from .pool import RotatorPool
+
+DEFAULT_PORT = 4540
+
+# ROTCTL methods reachable through /call; all but get_pos take over from the running job
+CALLS = ("get_pos", "set_pos", "move", "stop", "park", "send")
+
+
+class Job:
+    """
+    A tracking task running on one rotator in its own thread until done or cancelled.
+    """
+
+    def __init__(self, kind, params):
+        self.kind = kind
+        self.params = params
+        self.status = "starting"
+        self.started = time.time()
+        self.cancelled = threading.Event()
+        self.on_cancel = []
+        self.thread = None
+        self.error = None
+
+    def cancel(self):
+        self.cancelled.set()
+        for fn in self.on_cancel:
+            fn()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def as_dict(self):
+        return {"kind": self.kind, "params": self.params, "status": self.status, "started": self.started,
+                "running": self.running, "error": None if self.error is None else str(self.error)}
+
+
+class TrackingDaemon:
+    """
+    'rotators' maps names to rotators or open_rotator specs, 'observer' is {"lat", "lon", "elev"}
+    (degrees, meters) for TLE tracking. 'catalogue' is an optional TLEStore for tracking by NORAD ID or name.
+    """
+
+    def __init__(self, rotators, observer=None, catalogue=None):
+        self.pool = RotatorPool(rotators)
+        self.observer = observer or {"lat": 48.68333, "lon": 2.13333, "elev": 0}
+        self.catalogue = catalogue
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ts = None
+
+    def rotator(self, name=None):
+        return name or next(iter(self.pool.rotators))
+
+    def _start(self, name, kind, params, run):
+        job = Job(kind, params)
+        with self.lock:
+            old = self.jobs.get(name)
+            if old is not None:
+                old.cancel()
+            self.jobs[name] = job
+
+        def target():
+            try:
+                run(self.pool[name], job)
+                if job.cancelled.is_set():
+                    job.status = "cancelled"
+            except Exception as e:
+                job.error = e
+                job.status = "failed"
+
+        job.thread = threading.Thread(target=target, daemon=True)
+        job.thread.start()
+        return job
+
+    def cancel(self, name=None):
+        """
+        Cancel the job of one rotator (all rotators when 'name' is None).
+        """
+        with self.lock:
+            names = list(self.jobs) if name is None else [name]
+            for n in names:
+                job = self.jobs.get(n)
+                if job is not None:
+                    job.cancel()
+
+    def target(self, az, el, name=None):
+        name = self.rotator(name)
+        self.cancel(name)
+        return self.pool[name].set_pos(az, el, wait=False)
+
+    def track_tle(self, line1, line2, sat_name=None, period=1.0, name=None):
+        return self._start(self.rotator(name), "tle", {"line1": line1, "line2": line2, "name": sat_name},
+                           lambda rot, job: self._track_tle(rot, job, line1, line2, sat_name, period))
+
+    def track_satellite(self, key, period=1.0, name=None):
+        """
+        track_tle for a satellite of the catalogue (NORAD ID or name), KeyError if unknown.
+        """
+        if self.catalogue is None:
+            raise KeyError("No TLE catalogue loaded")
+        self.catalogue.ts = self._timescale()
+        satellite = self.catalogue.satellite(key)
+        return self._start(self.rotator(name), "tle", {"satellite": key, "name": satellite.name},
+                           lambda rot, job: self._track(rot, job, satellite, period))
+
+    def _timescale(self):
+        if self.ts is None:
+            from skyfield.api import load
+            self.ts = load.timescale()
+        return self.ts
+
+    def _track_tle(self, rot, job, line1, line2, sat_name, period):
+        from skyfield.api import EarthSatellite
+        satellite = EarthSatellite(line1, line2, sat_name or "Satellite", self._timescale())
+        self._track(rot, job, satellite, period)
+
+    def _track(self, rot, job, satellite, period):
+        from skyfield.api import Topos
+        from .tle_follow import PassPredictor
+        observer = Topos(latitude_degrees=self.observer["lat"], longitude_degrees=self.observer["lon"],
+                         elevation_m=self.observer.get("elev", 0))
+        predictor = PassPredictor(satellite, observer, self.ts)
+
+        while not job.cancelled.is_set():
+            p = predictor.next_pass()
+            if p is None:
+                job.status = "no pass in the next 24 h"
+                job.cancelled.wait(3600)
+                continue
+            job.status = f"waiting: {p}"
+            rot.set_pos(*(float(v) for v in p.position(max(p.aos, time.time()))), wait=False)
+            if job.cancelled.wait(max(p.aos - time.time(), 0)):
+                break
+            job.status = f"tracking: {p}"
+            while time.time() < p.los and not job.cancelled.is_set():
+                az, el = p.position(time.time())
+                rot.set_pos(float(az), float(el), wait=False)
+                job.cancelled.wait(period)
+
+    def follow(self, path, realtime=False, slew_rate=None, name=None):
+        def run(rot, job):
+            from .follow import Follow
+            f = Follow(rot, path)
+            job.on_cancel.append(lambda: setattr(f, "running", False))
+            job.status = "playing"
+            log = f._follow_path(realtime=realtime, slew_rate=slew_rate)
+            job.status = f"{len(log)} points played"
+
+        return self._start(self.rotator(name), "trajectory", {"path": path, "realtime": realtime}, run)
+
+    def stop(self, name=None):
+        """
+        Cancel the jobs and stop the rotators (one rotator when 'name' is given).
+        """
+        self.cancel(name)
+        if name is None:
+            return self.pool.emergency_stop()
+        return {name: self.pool[name].stop()}
+
+    def call(self, method, args=(), name=None):
+        if method not in CALLS:
+            raise ValueError(f"Unknown method '{method}'")
+        name = self.rotator(name)
+        if method != "get_pos":
+            self.cancel(name)
+        return getattr(self.pool[name], method)(*args)
+
+    def position(self):
+        return self.pool.get_pos(timeout=5)
+
+    def stats(self):
+        health = self.pool.health()
+        return {name: {"commands": rot.stats.stats(), "health": health[name]}
+                for name, rot in self.pool.rotators.items()}
+
+    def job_list(self):
+        with self.lock:
+            return {name: job.as_dict() for name, job in self.jobs.items()}
+
+    def exit(self):
+        self.cancel()
+        self.pool.exit()
+
+
+def _json(value):
+    # Exceptions and NumPy scalars in API answers
+    if isinstance(value, Exception):
+        return {"error": str(value), "type": type(value).__name__}
+    return float(value)
+
+
+class DaemonServer(ThreadingHTTPServer):
+    """
+    JSON API of a TrackingDaemon on http://host:port (localhost only by default).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, daemon, host="127.0.0.1", port=DEFAULT_PORT):
+        self.daemon = daemon
+        super().__init__((host, port), _ApiHandler)
+        self.port = self.server_address[1]
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+
+    # Keep-alive: a client reuses one connection; no Nagle delay between headers and body
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        daemon = self.server.daemon
+        routes = {
+            "/rotators": lambda: list(daemon.pool.rotators),
+            "/position": daemon.position,
+            "/stats": daemon.stats,
+            "/jobs": daemon.job_list,
+        }
+        if url.path not in routes:
+            self._reply(404, {"error": f"Unknown path {url.path}"})
+            return
+        try:
+            out = routes[url.path]()
+        except Exception as e:
+            self._reply(500, {"error": str(e), "type": type(e).__name__})
+            return
+        name = parse_qs(url.query).get("rotator", [None])[0]
+        if name is not None and isinstance(out, dict):
+            out = out.get(name)
+        self._reply(200, out)
+
+    def do_POST(self):
+        daemon = self.server.daemon
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            name = body.get("rotator")
+            if self.path == "/target":
+                out = daemon.target(body["az"], body["el"], name)
+            elif self.path == "/tle" and "satellite" in body:
+                out = daemon.track_satellite(body["satellite"], body.get("period", 1.0), name).as_dict()
+            elif self.path == "/tle":
+                out = daemon.track_tle(body["line1"], body["line2"], body.get("name"), body.get("period", 1.0),
+                                       name).as_dict()
+            elif self.path == "/trajectory":
+                out = daemon.follow(body["path"], body.get("realtime", False), body.get("slew_rate"), name).as_dict()
+            elif self.path == "/stop":
+                out = daemon.stop(name)
+            elif self.path == "/call":
+                out = daemon.call(body["method"], body.get("args", []), name)
+                if out is False:
+                    # ROTCTL methods return False on failure, the cause is in last_error
+                    error = daemon.pool[daemon.rotator(name)].last_error
+                    self._reply(200, {"result": False, "error": str(error), "type": type(error).__name__})
+                    return
+            else:
+                self._reply(404, {"error": f"Unknown path {self.path}"})
+                return
+        except (KeyError, ValueError, TypeError) as e:
+            self._reply(400, {"error": str(e), "type": type(e).__name__})
+            return
+        except Exception as e:
+            self._reply(500, {"error": str(e), "type": type(e).__name__})
+            return
+        self._reply(200, {"result": out})
+
+    def _reply(self, code, value):
+        body = json.dumps(value, default=_json).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class DaemonError(Exception):
+    """
+    Error answered by the daemon (the original exception type is in 'type').
+    """
+
+    def __init__(self, message, type=None):
+        super().__init__(message)
+        self.type = type
+
+
+class DaemonClient:
+    """
+    ROTCTL interface (get_pos, set_pos, move, move_async, stop, park, send) over the daemon API,
+    for one of its rotators. Each calling thread has its own keep-alive HTTP connection, so a
+    blocking call (move, set_pos with wait) does not hold up stop or position polling.
+    """
+
+    EPS = 1
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, rotator=None, timeout=60):
+        self.host = host
+        self.port = port
+        self.rotator = rotator
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.conns = []
+        self.last_error = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daemon-client")
+
+    def request(self, method, path, body=None):
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        # One retry on a fresh connection when the kept-alive one was closed
+        for attempt in range(2):
+            conn = getattr(self.local, "conn", None)
+            if conn is None:
+                conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                with self.lock:
+                    self.conns.append(conn)
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                r = conn.getresponse()
+                out = json.loads(r.read())
+                break
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                self.local.conn = None
+                with self.lock:
+                    self.conns.remove(conn)
+                if attempt:
+                    raise
+        if r.status != 200:
+            raise DaemonError(out.get("error"), out.get("type"))
+        return out
+
+    def _post(self, route, **body):
+        if self.rotator is not None:
+            body["rotator"] = self.rotator
+        out = self.request("POST", route, body)
+        if out["result"] is False and "error" in out:
+            self.last_error = DaemonError(out["error"], out["type"])
+        return out["result"]
+
+    def _get(self, path):
+        return self.request("GET", path if self.rotator is None else f"{path}?rotator={self.rotator}")
+
+    def call(self, method, *args):
+        try:
+            return self._post("/call", method=method, args=list(args))
+        except Exception as e:
+            self.last_error = e
+            return False
+
+    def get_pos(self, max_age=None):
+        pos = self.call("get_pos")
+        return False if pos is False else Position(*pos)
+
+    def set_pos(self, az, el, timeout=None, wait=True):
+        return self.call("set_pos", az, el, timeout, wait)
+
+    def move(self, dir, speed, step=EPS, timeout=None):
+        return self.call("move", dir, speed, step, timeout)
+
+    def move_async(self, dir, speed, step=EPS, timeout=None):
+        return self.executor.submit(self.move, dir, speed, step, timeout)
+
+    def stop(self):
+        return self.call("stop")
+
+    def park(self):
+        return self.call("park")
+
+    def send(self, command, timeout=3):
+        return self.call("send", command, timeout)
+
+    def target(self, az, el):
+        return self._post("/target", az=az, el=el)
+
+    def track_tle(self, line1, line2, name=None, period=1.0):
+        return self._post("/tle", line1=line1, line2=line2, name=name, period=period)
+
+    def track_satellite(self, key, period=1.0):
+        return self._post("/tle", satellite=key, period=period)
+
+    def follow(self, path, realtime=False, slew_rate=None):
+        return self._post("/trajectory", path=path, realtime=realtime, slew_rate=slew_rate)
+
+    def stop_all(self):
+        return self.request("POST", "/stop", {})["result"]
+
+    def position(self):
+        return self._get("/position")
+
+    def stats(self):
+        return self._get("/stats")
+
+    def jobs(self):
+        return self._get("/jobs")
+
+    def is_alive(self):
+        try:
+            self.request("GET", "/rotators")
+            return True
+        except Exception:
+            return False
+
+    def exit(self):
+        """
+        Close the connections to the daemon (the daemon and its rotators keep running).
+        """
+        self.executor.shutdown(wait=False)
+        with self.lock:
+            conns, self.conns = self.conns, []
+        for conn in conns:
+            conn.close()
+
+
+def serve(rotators, observer=None, host="127.0.0.1", port=DEFAULT_PORT, tle_files=None):
+    """
+    Run a daemon until interrupted. 'tle_files' (TLE/OMM) make up the catalogue of /tle {"satellite"}.
+    """
+    catalogue = None
+    if tle_files:
+        from .tle_store import TLEStore
+        catalogue = TLEStore.load(tle_files)
+        print(f"{len(catalogue)} satellites in the TLE catalogue")
+    daemon = TrackingDaemon(rotators, observer, catalogue)
+    server = DaemonServer(daemon, host, port)
+    print(f"Tracking daemon listening on http://{host}:{server.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.exit()
@@ -0,0 +1,114 @@
+""" Alexandre Hachet
+
+Classe qui prend en argument une suite de positions (azimuth, élévation) en fonction du temps
+pour que l'antenne suive un objet (typiquement satellite)
+
+Ou bien qui suive en temps réel un satellite en interrogeant l'API NOAA
+"""
+from .rotctl import *
+import threading
+import numpy as np
+from .trajectory import Trajectory, iter_points
+
+class Follow:
+
+    def __init__(self, rot, pos=[], planner=None):
+        # pos: (T, AZ, EL) lists, a trajectory file path or a trajectory.Trajectory
+        self.pos = pos
+        self.rot = rot
+        self.running = True
+        # planner.Planner: its learned latency is used as lead on the live target
+        self.planner = planner
+
+    @staticmethod
+    def _posfromtxt(file):
+        """
+        Lazy trajectory: the file is streamed by chunks (or memory-mapped for .trj files) while following.
+        """
+        return Trajectory(file)
+
+    # Playback log: scheduled track time, dispatch jitter (s), commanded and measured position
+    LOG_DTYPE = np.dtype([("t", "f8"), ("jitter", "f8"), ("cmd_az", "f8"), ("cmd_el", "f8"),
+                          ("az", "f8"), ("el", "f8")])
+
+    def _follow_path(self, realtime=False, slew_rate=None, measure=True):
+        """
+        Play the trajectory back at its timestamps on the monotonic clock.
+        realtime=True treats timestamps as absolute unix times, otherwise the first point is played now.
+        A point is dropped when the next one is already due, or when the rotator cannot reach it
+        at 'slew_rate' deg/s before the next one is due and the next point is closer (it is merged
+        into the next point). A target moving away faster than 'slew_rate' is still sent point by point.
+        Returns the playback log as a LOG_DTYPE array.
+        """
+        points = iter_points(self.pos)
+        cur = next(points, None)
+        if cur is None:
+            return np.empty(0, dtype=self.LOG_DTYPE)
+
+        start = time.monotonic()
+        offset = time.time() - start if realtime else cur[0] - start
+        log, last = [], None
+
+        while cur is not None and self.running:
+            nxt = next(points, None)
+            t, az, el = cur
+            due = t - offset
+            now = time.monotonic()
+
+            if nxt is not None:
+                next_due = nxt[0] - offset
+                late = next_due <= now
+                unreachable = slew_rate and last and tools.dist4tuple(last, (az, el)) / slew_rate > next_due - now
+                # Only worth skipping when heading straight for the next point is shorter
+                if late or (unreachable and tools.dist4tuple(last, nxt[1:]) < tools.dist4tuple(last, (az, el))):
+                    cur = nxt
+                    continue
+
+            if due > now:
+                time.sleep(due - now)
+            jitter = time.monotonic() - due
+            self.rot.set_pos(az, el, wait=False)
+            last = (az, el)
+
+            # No answer (link down, reconnecting): the point is logged without a measured position
+            pos = self.rot.get_pos() if measure else False
+            act = tools.parse_pos(pos) if pos is not False else (np.nan, np.nan)
+            log.append((t, jitter, az, el, act[0], act[1]))
+            cur = nxt
+
+        return np.array(log, dtype=self.LOG_DTYPE)
+
+    def _follow_routine(self, *args):
+        from .get_noaa import SatelliteTracker
+        while self.running:
+            lead = self.planner.model.latency if self.planner else 0
+            try:
+                target = SatelliteTracker.fetch_positions(time.time() + lead)
+            except Exception as e:
+                print(f"Target unavailable: {e}")
+                target = None
+            if target is None:
+                time.sleep(1)
+                continue
+            target = (target["azimuth"], target["elevation"])
+            if self.rot.telemetry is not None:
+                self.rot.telemetry.record("T", target=target)
+            self.rot.set_pos(*target)
+            while self.running:
+                pos = self.rot.get_pos()
+                # No answer (link down, reconnecting): retry instead of ending the thread
+                if pos is False:
+                    time.sleep(0.5)
+                    break
+                if tools.dist4tuple(target, tools.parse_pos(pos)) >= ROTCTL.EPS:
+                    break
+                time.sleep(0.5)
+    
+    def _follow(self):
+        threading.Thread(target=self._follow_routine, args=[self]).start()
+
+    def _unflollow(self):
+        self.running = False
+
+
+    
@@ -0,0 +1,178 @@
+import threading
+import numpy as np
+from datetime import datetime, timezone
+
+TRACK_DTYPE = np.dtype([("t", "f8"), ("az", "f8"), ("el", "f8"), ("lat", "f8"), ("lon", "f8"), ("alt", "f8")])
+
+
+def parse_feed(data):
+    """
+    Parse an n2yo instant-tracking response once into a TRACK_DTYPE structured array sorted by time.
+    Each 'd' string is "lat|lon|alt|el|az|...|timestamp" (timestamp is the 10th field).
+    """
+    if not (isinstance(data, list) and len(data) > 0):
+        return np.empty(0, dtype=TRACK_DTYPE)
+    rows = [fields[:10] for fields in (pos["d"].split("|") for pos in data[0]["pos"]) if len(fields) >= 10]
+    if not rows:
+        return np.empty(0, dtype=TRACK_DTYPE)
+    raw = np.array(rows, dtype=np.float64)
+
+    track = np.empty(len(raw), dtype=TRACK_DTYPE)
+    for name, col in (("t", 9), ("az", 4), ("el", 3), ("lat", 0), ("lon", 1), ("alt", 2)):
+        track[name] = raw[:, col]
+    return np.sort(track, order="t")
+
+
+class Track:
+    """
+    Parsed feed with precomputed interpolation data.
+    at() answers any number of target times with one searchsorted, 'linear' or 'spline' (cubic Hermite).
+    """
+
+    FIELDS = ("az", "el", "lat", "lon", "alt")
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.t = samples["t"]
+        # Azimuth unwrapped so interpolation across north stays continuous
+        self.values = {name: samples[name] for name in self.FIELDS}
+        self.values["az"] = np.degrees(np.unwrap(np.radians(samples["az"])))
+        self.slopes = None
+
+    def __len__(self):
+        return len(self.t)
+
+    def at(self, times, kind="linear"):
+        """
+        Interpolated TRACK_DTYPE rows for the given times, clamped to the track ends.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        out = np.empty(len(times), dtype=TRACK_DTYPE)
+        out["t"] = times
+        if len(self.t) == 1:
+            for name in self.FIELDS:
+                out[name] = self.values[name][0]
+            return out
+
+        i = np.clip(np.searchsorted(self.t, times, side="right") - 1, 0, len(self.t) - 2)
+        h = self.t[i + 1] - self.t[i]
+        s = np.clip((times - self.t[i]) / h, 0.0, 1.0)
+
+        if kind == "spline":
+            if self.slopes is None:
+                self.slopes = {name: np.gradient(v, self.t) for name, v in self.values.items()}
+            s2, s3 = s * s, s * s * s
+            h00, h10, h01, h11 = 2 * s3 - 3 * s2 + 1, s3 - 2 * s2 + s, 3 * s2 - 2 * s3, s3 - s2
+            for name, v in self.values.items():
+                m = self.slopes[name]
+                out[name] = h00 * v[i] + h10 * h * m[i] + h01 * v[i + 1] + h11 * h * m[i + 1]
+        else:
+            for name, v in self.values.items():
+                out[name] = v[i] + s * (v[i + 1] - v[i])
+
+        out["az"] %= 360
+        return out
+
+
+class PositionFeed:
+    """
+    Cache of the n2yo instant-tracking feed.
+    Each response holds several minutes of positions ('d' parameter of the url): the whole track is kept,
+    positions are interpolated locally and the feed is refetched in the background 'prefetch' seconds
+    before the cached window runs out.
+    """
+
+    def __init__(self, url, headers=None, prefetch=60, timeout=10, session=None):
+        self.url = url
+        self.headers = headers or {}
+        self.prefetch = prefetch
+        self.timeout = timeout
+        if session is None:
+            # requests is only loaded once a feed is actually used
+            import requests
+            session = requests.Session()
+        self.session = session
+        self.refreshing = False
+        self.track = None
+
+    def fetch(self):
+        """
+        Download and parse the feed, replacing the cached track.
+        """
+        r = self.session.get(self.url, headers=self.headers, timeout=self.timeout)
+        self.track = Track(parse_feed(r.json()))
+
+    def _refresh(self):
+        try:
+            self.fetch()
+        except Exception as e:
+            print(f"Feed refresh failed: {e}")
+        finally:
+            self.refreshing = False
+
+    def positions(self, times, kind="linear"):
+        """
+        Batch lookup: TRACK_DTYPE rows for an array of unix times, None if the feed is empty.
+        """
+        last = np.max(times)
+        track = self.track
+        if track is None or len(track) == 0 or last > track.t[-1]:
+            self.fetch()
+        elif track.t[-1] - last < self.prefetch and not self.refreshing:
+            self.refreshing = True
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+        track = self.track
+        if len(track) == 0:
+            return None
+        return track.at(times, kind)
+
+    def position(self, target_time, kind="linear"):
+        """
+        Position at 'target_time' (unix seconds).
+        Returns the same dict as SatelliteTracker.fetch_positions, None if the feed is empty.
+        """
+        rows = self.positions(target_time, kind)
+        if rows is None:
+            return None
+        s = rows[0]
+        return {
+            "time": datetime.fromtimestamp(int(s["t"]), tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+            "latitude": float(s["lat"]),
+            "longitude": float(s["lon"]),
+            "altitude_km": float(s["alt"]),
+            "azimuth": float(s["az"]),
+            "elevation": float(s["el"])
+        }
+
+
+N2YO_URL = "https://www.n2yo.com/sat/instant-tracking.php?s={id}&hlat={lat}&hlng={lon}&d=300&r=789964367127.4452&tz=GMT+01:00&O=n2yocom&rnd_str=38461526dff975b9cebfdc6ac2abb3d6&callback="
+
+
+class SatelliteTracker:
+    id = 29155#"54234"
+    url = N2YO_URL.format(id=id, lat=48.68333, lon=2.13333)
+    headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
+    feed = None
+
+    @staticmethod
+    def set_satellite(norad_id, lat=48.68333, lon=2.13333):
+        """
+        Follow another NORAD ID (seen from lat/lon); the cached feed is dropped.
+        """
+        SatelliteTracker.id = int(norad_id)
+        SatelliteTracker.url = N2YO_URL.format(id=SatelliteTracker.id, lat=lat, lon=lon)
+        SatelliteTracker.feed = None
+
+    @staticmethod
+    def fetch_positions(target_time):
+        """
+        Position at 'target_time', served from the shared PositionFeed (one HTTP call every few minutes).
+        """
+        if SatelliteTracker.feed is None:
+            SatelliteTracker.feed = PositionFeed(SatelliteTracker.url, SatelliteTracker.headers)
+        return SatelliteTracker.feed.position(target_time)
+
+    @staticmethod
+    def getPos():
+        return SatelliteTracker.fetch_positions(int(datetime.now(timezone.utc).timestamp()))
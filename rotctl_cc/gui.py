@@ -0,0 +1,271 @@
+""" Alexandre Hachet
+
+Interface graphique de contrôle du rotor.
+
+Toutes les commandes passent par un seul thread d'E/S (RotorWorker) et sa file : les widgets
+Tk ne sont touchés que par le thread principal, qui relit la dernière position par after()
+à la fréquence 'refresh' et trace la trajectoire sur un diagramme polaire. Stop vide la file
+et passe avant les déplacements en attente. Les déplacements manuels (flèches) sont arrêtés par
+ce même thread, qui les abandonne dès qu'une autre commande est demandée.
+"""
+
+import collections
+import math
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from .rotctl import ROTCTL, tools
+
+
+class RotorWorker:
+    """
+    Single I/O thread owning the rotator: runs queued commands in order and polls the position
+    'refresh' times per second when idle. The last reading is in 'latest' as (t, az, el).
+    A manual move is stopped by the polls once the rotator has moved its step, and forgotten as
+    soon as another command (or Stop) is queued.
+    """
+
+    def __init__(self, rot, refresh=10.0, move_timeout=10.0):
+        self.rot = rot
+        self.period = 1 / refresh
+        self.move_timeout = move_timeout
+        self.cond = threading.Condition()
+        self.pending = collections.deque()
+        # Bumped by every queued command; a move started for an older one is not watched
+        self.gen = 0
+        # Manual move in progress: (start az, start el, step, deadline)
+        self.moving = None
+        self.latest = None
+        self.error = None
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, fn, *args):
+        with self.cond:
+            self.gen += 1
+            self.moving = None
+            self.pending.append((fn, args))
+            self.cond.notify()
+        return self.gen
+
+    def move(self, direction, speed, step):
+        """
+        Queue a manual move ('M direction speed'), stopped once the rotator has moved 'step' degrees.
+        """
+        with self.cond:
+            gen = self.gen + 1
+        self.submit(self._move, direction, speed, step, gen)
+
+    def stop(self):
+        """
+        Drop the queued commands and stop the rotator next.
+        """
+        with self.cond:
+            self.gen += 1
+            self.moving = None
+            self.pending.clear()
+            self.pending.append((self.rot.stop, ()))
+            self.cond.notify()
+
+    def close(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join()
+
+    def _run(self):
+        next_poll = time.monotonic()
+        while True:
+            with self.cond:
+                while self.running and not self.pending and time.monotonic() < next_poll:
+                    self.cond.wait(next_poll - time.monotonic())
+                if not self.running:
+                    return
+                job = self.pending.popleft() if self.pending else None
+
+            if job is None:
+                next_poll = time.monotonic() + self.period
+                fn, args = self._poll, ()
+            else:
+                fn, args = job
+            try:
+                if fn(*args) is False:
+                    self.error = f"{getattr(fn, '__name__', fn)} failed"
+            except Exception as e:
+                self.error = str(e)
+
+    def _move(self, direction, speed, step, gen):
+        res = self.rot.get_pos(max_age=0)
+        if res is False:
+            return False
+        az, el = tools.parse_pos(res)
+        out = self.rot.send(f"M {direction} {speed}")
+        with self.cond:
+            if self.gen == gen:
+                self.moving = (az, el, step, time.monotonic() + self.move_timeout)
+        return out
+
+    def _poll(self):
+        res = self.rot.get_pos()
+        if res is False:
+            return False
+        az, el = tools.parse_pos(res)
+        self.latest = (time.time(), az, el)
+        moving = self.moving
+        if moving is not None:
+            start_az, start_el, step, deadline = moving
+            if tools.dist4tuple((start_az, start_el), (az, el)) >= step or time.monotonic() > deadline:
+                with self.cond:
+                    if self.moving is not moving:
+                        return
+                    self.moving = None
+                return self.rot.stop()
+
+
+class PolarPlot(tk.Canvas):
+    """
+    Sky view: azimuth clockwise from north, elevation 90° at the center and 0° on the outer circle.
+    The track is one polyline item whose coordinates are replaced on each refresh.
+    """
+
+    def __init__(self, master, size=240, trail=600, **kwargs):
+        super().__init__(master, width=size, height=size, background="white", **kwargs)
+        self.c = size / 2
+        self.r = size / 2 - 16
+        self.trail = collections.deque(maxlen=trail)
+        for el in (0, 30, 60):
+            k = self.r * (90 - el) / 90
+            self.create_oval(self.c - k, self.c - k, self.c + k, self.c + k, outline="#ccc")
+        for az, name in ((0, "N"), (90, "E"), (180, "S"), (270, "W")):
+            x, y = self.xy(az, 0)
+            self.create_line(self.c, self.c, x, y, fill="#ccc")
+            lx, ly = self.xy(az, -12)
+            self.create_text(lx, ly, text=name)
+        self.track = self.create_line(0, 0, 0, 0, fill="blue")
+        self.target = self.create_text(-20, -20, text="+", fill="red", font=("Arial", 14))
+        self.antenna = self.create_oval(-20, -20, -20, -20, fill="blue", outline="")
+
+    def xy(self, az, el):
+        k = self.r * (90 - max(-20.0, min(90.0, el))) / 90
+        a = math.radians(az)
+        return self.c + k * math.sin(a), self.c - k * math.cos(a)
+
+    def add(self, az, el):
+        x, y = self.xy(az, el)
+        self.trail.append((x, y))
+        if len(self.trail) > 1:
+            self.coords(self.track, *[v for p in self.trail for v in p])
+        self.coords(self.antenna, x - 4, y - 4, x + 4, y + 4)
+
+    def set_target(self, az, el):
+        self.coords(self.target, *self.xy(az, el))
+
+
+class RotatorGUI(tk.Tk):
+    """
+    'rot' is any object with the ROTCTL interface (ROTCTL, ROTCTLD, simulator...); a ROTCTL on
+    'model'/'device' is opened when it is None. 'refresh' is the display rate in Hz.
+    """
+
+    # Manual moves: rotator speed (1-100) and degrees per click
+    SPEED = 50
+    STEP = 5.0
+
+    def __init__(self, rot=None, model=1, device="/dev/ttyUSB0", refresh=10.0):
+        super().__init__()
+        self.title("ROTCTL Control Center")
+        self.resizable(False, False)
+
+        self.rot = rot if rot is not None else ROTCTL(model=model, device=device)
+        self.refresh_ms = max(1, int(1000 / refresh))
+        self.worker = RotorWorker(self.rot, refresh)
+        self.shown = None
+        self.error_until = None
+
+        self.az_var = tk.DoubleVar(value=0.0)
+        self.el_var = tk.DoubleVar(value=0.0)
+
+        self._build_ui()
+        self.after(self.refresh_ms, self._refresh)
+
+    def _build_ui(self):
+        frm = ttk.Frame(self, padding=20)
+        frm.pack(fill="both", expand=True)
+
+        left = ttk.Frame(frm)
+        left.grid(row=0, column=0, sticky="nsew")
+
+        ttk.Label(left, text="Azimuth (°)", font=("Arial", 12)).grid(row=0, column=0, sticky="w", pady=(0, 5))
+        self.az_entry = ttk.Entry(left, textvariable=self.az_var, width=10)
+        self.az_entry.grid(row=0, column=1, sticky="w", padx=5)
+        self.az_label = ttk.Label(left, text="Lecture: 0.0°", font=("Arial", 10))
+        self.az_label.grid(row=0, column=2, padx=10)
+
+        ttk.Label(left, text="Élévation (°)", font=("Arial", 12)).grid(row=1, column=0, sticky="w", pady=(10, 5))
+        self.el_entry = ttk.Entry(left, textvariable=self.el_var, width=10)
+        self.el_entry.grid(row=1, column=1, sticky="w", padx=5)
+        self.el_label = ttk.Label(left, text="Lecture: 0.0°", font=("Arial", 10))
+        self.el_label.grid(row=1, column=2, padx=10)
+
+        self.send_btn = ttk.Button(left, text="Envoyer position", command=self._send_pos)
+        self.send_btn.grid(row=2, column=0, columnspan=3, pady=20, sticky="ew")
+
+        pad = ttk.Frame(left)
+        pad.grid(row=3, column=0, columnspan=3)
+        ttk.Button(pad, text="↑", width=5, command=lambda: self._move(ROTCTL.UP)).grid(row=0, column=1, pady=5)
+        ttk.Button(pad, text="←", width=5, command=lambda: self._move(ROTCTL.LEFT)).grid(row=1, column=0, padx=5)
+        ttk.Button(pad, text="Stop", width=5, command=self.worker.stop).grid(row=1, column=1, pady=5)
+        ttk.Button(pad, text="→", width=5, command=lambda: self._move(ROTCTL.RIGHT)).grid(row=1, column=2, padx=5)
+        ttk.Button(pad, text="↓", width=5, command=lambda: self._move(ROTCTL.DOWN)).grid(row=2, column=1, pady=5)
+
+        self.status = ttk.Label(left, text="", foreground="red")
+        self.status.grid(row=4, column=0, columnspan=3, sticky="w")
+
+        self.plot = PolarPlot(frm)
+        self.plot.grid(row=0, column=1, padx=(20, 0))
+
+    def _send_pos(self):
+        try:
+            az, el = self.az_var.get(), self.el_var.get()
+        except tk.TclError:
+            self.status.config(text="Position invalide")
+            return
+        self.plot.set_target(az, el)
+        self.worker.submit(self.rot.set_pos, az, el, None, False)
+
+    def _move(self, direction):
+        self.worker.move(direction, self.SPEED, self.STEP)
+
+    def _refresh(self):
+        latest = self.worker.latest
+        if latest is not None and latest is not self.shown:
+            self.shown = latest
+            t, az, el = latest
+            self.az_label.config(text=f"{az:.1f}°")
+            self.el_label.config(text=f"{el:.1f}°")
+            self.plot.add(az, el)
+        # Errors stay on screen for a few seconds
+        if self.worker.error:
+            self.status.config(text=self.worker.error)
+            self.worker.error = None
+            self.error_until = time.monotonic() + 3
+        elif self.error_until and time.monotonic() > self.error_until:
+            self.status.config(text="")
+            self.error_until = None
+        self.after(self.refresh_ms, self._refresh)
+
+    def on_close(self):
+        self.worker.close()
+        try:
+            self.rot.exit()
+        except Exception:
+            pass
+        self.destroy()
+
+
+if __name__ == "__main__":
+    app = RotatorGUI(model=1, device="/dev/tty.usbserial-XXXXX")
+    app.protocol("WM_DELETE_WINDOW", app.on_close)
+    app.mainloop()
@@ -0,0 +1,151 @@
+""" Alexandre Hachet
+
+Décodage des réponses de rotctl et rotctld en mode de réponse étendu ("+p", "+P az el", ...).
+
+Une réponse est un bloc "get_pos:", les lignes de valeurs, puis "RPRT n". Les valeurs sont
+renvoyées telles quelles, get_pos est décodé en Position(az, el), et un code RPRT non nul
+lève l'exception HamlibError correspondant au code d'erreur de Hamlib.
+"""
+
+import re
+from collections import namedtuple
+
+# Rotator position in degrees; a namedtuple has no instance __dict__ (slotted) and unpacks as (az, el)
+Position = namedtuple("Position", ["az", "el"])
+
+# Builds a Position without going through the namedtuple's Python-level __new__
+_new_position = tuple.__new__
+
+NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class HamlibError(Exception):
+    """
+    Error reported by rotctl/rotctld through a non-zero 'RPRT n' line.
+    """
+
+    def __init__(self, command, code):
+        super().__init__(f"Hamlib returned RPRT {code} ({MESSAGES.get(code, 'error')}) for '{command}'")
+        self.command = command
+        self.code = code
+
+
+class InvalidParamError(HamlibError):
+    pass
+
+
+class UnsupportedCommandError(HamlibError):
+    pass
+
+
+class HamlibTimeoutError(HamlibError, TimeoutError):
+    pass
+
+
+class HamlibIOError(HamlibError):
+    pass
+
+
+class ProtocolError(HamlibError):
+    pass
+
+
+class RejectedError(HamlibError):
+    pass
+
+
+# Hamlib rig_errcode_e (negated in RPRT lines)
+MESSAGES = {
+    -1: "invalid parameter",
+    -2: "invalid configuration",
+    -3: "memory shortage",
+    -4: "function not implemented",
+    -5: "communication timed out",
+    -6: "IO error",
+    -7: "internal Hamlib error",
+    -8: "protocol error",
+    -9: "command rejected by the rotator",
+    -10: "command performed, but arg truncated",
+    -11: "function not available",
+    -12: "VFO not targetable",
+    -13: "error talking on the bus",
+    -14: "collision on the bus",
+    -15: "NULL RIG handle or invalid pointer parameter",
+    -16: "invalid VFO",
+    -17: "argument out of domain of func",
+    -18: "function deprecated",
+    -19: "security error",
+    -20: "rig is not powered on",
+}
+
+ERRORS = {
+    -1: InvalidParamError,
+    -4: UnsupportedCommandError,
+    -5: HamlibTimeoutError,
+    -6: HamlibIOError,
+    -8: ProtocolError,
+    -9: RejectedError,
+    -10: ProtocolError,
+    -11: UnsupportedCommandError,
+    -13: HamlibIOError,
+    -14: HamlibIOError,
+    -15: InvalidParamError,
+    -17: InvalidParamError,
+}
+
+
+def error(command, code):
+    """
+    HamlibError subclass instance for an RPRT code.
+    """
+    return ERRORS.get(code, HamlibError)(command, code)
+
+
+def parse_block(command, text):
+    """
+    Value lines of an extended response ('name:' header, values, 'RPRT n'), as read between two
+    prompts of rotctl (with terminal echo off) or up to the RPRT line of rotctld.
+    """
+    # Called on every poll: plain string operations, the RPRT line is the last one
+    body, _, last = text.strip().rpartition("\n")
+    if last == "RPRT 0":
+        return body.splitlines()[1:]
+    if not last.startswith("RPRT "):
+        raise ProtocolError(command, -8)
+    try:
+        code = int(last[5:])
+    except ValueError:
+        raise ProtocolError(command, -8)
+    if code == 0:
+        return body.splitlines()[1:]
+    raise error(command, code)
+
+
+def parse_pos(values):
+    """
+    Position from the value lines of 'p' (["Azimuth: 163.000000", "Elevation: 41.000000"]).
+    """
+    return _new_position(Position, (float(values[0].rpartition(" ")[2]), float(values[1].rpartition(" ")[2])))
+
+
+def parse_pos_block(command, text):
+    """
+    parse_pos(parse_block(command, text)) for the get_pos poll: header, two value lines and 'RPRT 0'
+    are split in one go, any other answer goes through parse_block.
+    """
+    text = text.strip()
+    if text.endswith("\nRPRT 0"):
+        try:
+            _, az, el, _ = text.split("\n", 3)
+            return _new_position(Position, (float(az.rpartition(" ")[2]), float(el.rpartition(" ")[2])))
+        except ValueError:
+            pass
+    return parse_pos(parse_block(command, text))
+
+
+def parse_pos_text(text):
+    """
+    Position from any textual get_pos answer: "Azimuth: 163.0\\r\\nElevation: 41.0" or "163.0\\n41.0".
+    """
+    az, el = NUMBER.findall(text)[:2]
+    return Position(float(az), float(el))
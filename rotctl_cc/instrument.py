@@ -0,0 +1,97 @@
+""" Alexandre Hachet
+
+Mesure du temps passé par commande rotctl.
+
+Pour chaque lettre de commande : histogramme de latence (p50/p99), nombre d'appels,
+d'erreurs et de timeouts. Les statistiques sont lisibles par stats() ou exposées au format
+texte Prometheus par un petit serveur HTTP local (metrics.py).
+"""
+
+import bisect
+import threading
+
+# Bucket upper bounds: 10 µs to ~50 s, 25 % apart
+BOUNDS = [1e-5 * 1.25 ** k for k in range(70)]
+
+
+class LatencyHistogram:
+
+    def __init__(self):
+        self.buckets = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, latency):
+        self.buckets[bisect.bisect_left(BOUNDS, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        self.max = max(self.max, latency)
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket holding the q-th quantile (at most 25 % above the true value).
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(BOUNDS[i], self.max) if i < len(BOUNDS) else self.max
+        return self.max
+
+
+class CommandStats:
+    """
+    Per-command-letter latency histograms, counts, errors and timeouts.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.commands = {}
+
+    def observe(self, cmd, latency, error=None, timeout=False):
+        with self.lock:
+            entry = self.commands.get(cmd)
+            if entry is None:
+                entry = self.commands[cmd] = [LatencyHistogram(), 0, 0]
+            entry[0].add(latency)
+            if error is not None:
+                entry[1] += 1
+            if timeout:
+                entry[2] += 1
+
+    def stats(self):
+        with self.lock:
+            return {cmd: {"count": h.count,
+                          "errors": errors,
+                          "timeouts": timeouts,
+                          "mean_s": h.sum / h.count,
+                          "p50_s": h.quantile(0.5),
+                          "p99_s": h.quantile(0.99),
+                          "max_s": h.max}
+                    for cmd, (h, errors, timeouts) in self.commands.items()}
+
+    def reset(self):
+        with self.lock:
+            self.commands = {}
+
+    def prometheus(self, prefix="rotctl"):
+        """
+        Prometheus text exposition format.
+        """
+        lines = [f"# TYPE {prefix}_command_latency_seconds summary"]
+        stats = self.stats()
+        for cmd, s in stats.items():
+            label = f'cmd="{cmd}"'
+            lines.append(f'{prefix}_command_latency_seconds{{{label},quantile="0.5"}} {s["p50_s"]:.6g}')
+            lines.append(f'{prefix}_command_latency_seconds{{{label},quantile="0.99"}} {s["p99_s"]:.6g}')
+            lines.append(f'{prefix}_command_latency_seconds_sum{{{label}}} {s["mean_s"] * s["count"]:.6g}')
+            lines.append(f'{prefix}_command_latency_seconds_count{{{label}}} {s["count"]}')
+        for name in ("errors", "timeouts"):
+            lines.append(f"# TYPE {prefix}_command_{name}_total counter")
+            for cmd, s in stats.items():
+                lines.append(f'{prefix}_command_{name}_total{{cmd="{cmd}"}} {s[name]}')
+        return "\n".join(lines) + "\n"
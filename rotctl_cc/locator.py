@@ -0,0 +1,183 @@
+""" Alexandre Hachet
+
+Conversions de coordonnées de la librairie Hamlib (locator.c), calculées dans Python.
+
+Locator Maidenhead, degrés/minutes/secondes, distance et azimut QRB, chemin long : mêmes
+formules et mêmes résultats que les commandes L, l, D, d, E, e, B, A et a de rotctl, sans
+aller-retour avec le processus rotctl ni rotor connecté. Toutes les fonctions acceptent des
+scalaires ou des tableaux NumPy (même forme pour tous les arguments, ou diffusables).
+"""
+
+import numpy as np
+
+# Kilometers per degree of arc on the earth surface (60 nautical miles)
+ARC_IN_KM = 111.2
+
+# Values per character of each locator pair: field (A-R), square (0-9), subsquare (A-X)...
+LOC_CHAR_RANGE = (18, 10, 24, 10, 24, 10)
+MIN_LOCATOR_PAIRS = 1
+MAX_LOCATOR_PAIRS = 6
+
+
+def _out(x, scalar):
+    # Python scalars for scalar inputs, arrays otherwise
+    return x.item() if scalar else x
+
+
+def lonlat2loc(lon, lat, loc_len=6):
+    """
+    Maidenhead locator of 'loc_len' characters (even, 2 to 12) for longitude/latitude in degrees.
+    lonlat2loc(-170.0, -85.0, 12) -> "AA55AA00AA00"
+    """
+    pairs = loc_len // 2
+    if not MIN_LOCATOR_PAIRS <= pairs <= MAX_LOCATOR_PAIRS:
+        raise ValueError(f"Locator length {loc_len} not in 2-12")
+    lon, lat = np.broadcast_arrays(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+    scalar = lon.ndim == 0
+
+    chars = np.empty(lon.shape + (2 * pairs,), dtype=np.uint8)
+    for x_or_y, ordinate in enumerate((lon / 2.0, lat)):
+        # The 1e-6 guards against floating point rounding errors (as in Hamlib)
+        ordinate = np.fmod(ordinate + 270.000001, 180.0)
+        divisions = 1
+        for pair in range(pairs):
+            divisions *= LOC_CHAR_RANGE[pair]
+            square = 180.0 / divisions
+            value = (ordinate / square).astype(np.int64)
+            ordinate = ordinate - square * value
+            chars[..., pair * 2 + x_or_y] = value + (ord("0") if LOC_CHAR_RANGE[pair] == 10 else ord("A"))
+
+    loc = chars.view(f"S{2 * pairs}")[..., 0].astype(str)
+    return str(loc) if scalar else loc
+
+
+def loc2lonlat(locator):
+    """
+    (longitude, latitude) in degrees of the center of a 2 to 12 character locator square.
+    loc2lonlat("AA55AA00AA00") -> (-169.999983, -84.999991)
+    Lowercase letters are accepted; an array of locators may mix lengths.
+    """
+    locs = np.asarray(locator, dtype=str)
+    scalar = locs.ndim == 0
+    flat = np.char.upper(locs.ravel())
+    lon = np.empty(flat.shape)
+    lat = np.empty(flat.shape)
+
+    lengths = np.char.str_len(flat)
+    for length in np.unique(lengths):
+        pairs = min(int(length) // 2, MAX_LOCATOR_PAIRS)
+        if pairs < MIN_LOCATOR_PAIRS:
+            raise ValueError(f"Locator too short: {flat[lengths == length][0]!r}")
+        rows = lengths == length
+        chars = np.frombuffer(flat[rows].astype(f"S{length}").tobytes(), dtype=np.uint8)
+        chars = chars.reshape(-1, int(length)).astype(np.int64)
+
+        xy = []
+        for x_or_y in range(2):
+            ordinate = np.full(len(chars), -90.0)
+            divisions = 1
+            for pair in range(pairs):
+                base = ord("0") if LOC_CHAR_RANGE[pair] == 10 else ord("A")
+                value = chars[:, pair * 2 + x_or_y] - base
+                if np.any((value < 0) | (value >= LOC_CHAR_RANGE[pair])):
+                    raise ValueError(f"Invalid locator in {flat[rows].tolist()}")
+                divisions *= LOC_CHAR_RANGE[pair]
+                ordinate += value * 180.0 / divisions
+            # Center in the square
+            xy.append(ordinate + 90.0 / divisions)
+        lon[rows] = xy[0] * 2.0
+        lat[rows] = xy[1]
+
+    return _out(lon.reshape(locs.shape), scalar), _out(lat.reshape(locs.shape), scalar)
+
+
+def dms2dec(deg, min, sec, sw):
+    """
+    Signed decimal degrees from degrees, minutes, seconds and the S/W flag (1 south or west).
+    """
+    scalar = np.ndim(deg) == 0 and np.ndim(min) == 0 and np.ndim(sec) == 0 and np.ndim(sw) == 0
+    st = np.abs(np.asarray(deg)) + np.abs(np.asarray(min)) / 60.0 + np.abs(np.asarray(sec, dtype=np.float64)) / 3600.0
+    return _out(np.where(np.asarray(sw) == 1, -st, st), scalar)
+
+
+def dec2dms(dec):
+    """
+    (degrees, minutes, seconds, S/W) from signed decimal degrees, folded into -180..180.
+    """
+    dec = np.asarray(dec, dtype=np.float64)
+    scalar = dec.ndim == 0
+    st = np.fmod(dec + 180, 360) - 180
+    sw = ((st < 0) & (st != -180)).astype(np.int64)
+    st = np.abs(st)
+    deg = np.floor(st)
+    st = 60.0 * (st - deg)
+    min = np.floor(st)
+    sec = 60.0 * (st - min)
+    return (_out(deg.astype(np.int64), scalar), _out(min.astype(np.int64), scalar),
+            _out(sec, scalar), _out(sw, scalar))
+
+
+def dmmm2dec(deg, dec_min, sw):
+    """
+    Signed decimal degrees from degrees, decimal minutes and the S/W flag.
+    """
+    return dms2dec(deg, dec_min, 0.0, sw)
+
+
+def dec2dmmm(dec):
+    """
+    (degrees, decimal minutes, S/W) from signed decimal degrees.
+    """
+    deg, min, sec, sw = dec2dms(dec)
+    return deg, min + sec / 60.0, sw
+
+
+def qrb(lon1, lat1, lon2, lat2):
+    """
+    Great circle (distance in km, short path azimuth in whole degrees) from station 1 to station 2.
+    Coincident stations give (0, 0), antipodal ones (180 * ARC_IN_KM, 0).
+    """
+    lon1, lat1, lon2, lat2 = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (lon1, lat1, lon2, lat2)))
+    scalar = lon1.ndim == 0
+    if np.any(np.abs(lat1) > 90) or np.any(np.abs(lat2) > 90):
+        raise ValueError("Latitude out of -90..90")
+    if np.any(np.abs(lon1) > 180) or np.any(np.abs(lon2) > 180):
+        raise ValueError("Longitude out of -180..180")
+
+    # Keep acos() in its domain at the poles
+    lat1 = np.radians(np.clip(lat1, -89.999999999, 89.999999999))
+    lat2 = np.radians(np.clip(lat2, -89.999999999, 89.999999999))
+    delta = np.radians(lon2 - lon1)
+
+    tmp = np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) * np.cos(delta)
+    distance = ARC_IN_KM * np.degrees(np.arccos(np.clip(tmp, -1.0, 1.0)))
+    az = np.degrees(np.arctan2(np.sin(delta) * np.cos(lat2),
+                               np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(delta)))
+    az = np.fmod(360.0 + az, 360.0)
+    az = np.where(az < 0, az + 360, np.where(az >= 360, az - 360, az))
+    azimuth = np.floor(az + 0.5)
+
+    coincide = tmp > .999999999999999
+    antipodal = tmp < -.999999
+    distance = np.where(coincide, 0.0, np.where(antipodal, 180.0 * ARC_IN_KM, distance))
+    azimuth = np.where(coincide | antipodal, 0.0, azimuth)
+    return _out(distance, scalar), _out(azimuth, scalar)
+
+
+def azimuth_long_path(azimuth):
+    """
+    Long path azimuth (degrees) from a short path azimuth in 0..360.
+    """
+    az = np.asarray(azimuth, dtype=np.float64)
+    if np.any((az < 0) | (az > 360)):
+        raise ValueError("Azimuth out of 0..360")
+    out = np.where((az == 0) | (az == 360), 180.0, np.where(az < 180, az + 180, az - 180))
+    return _out(out, az.ndim == 0)
+
+
+def distance_long_path(distance):
+    """
+    Long path distance (km) from a short path distance in km.
+    """
+    d = np.asarray(distance, dtype=np.float64)
+    return _out(ARC_IN_KM * 360.0 - d, d.ndim == 0)
@@ -0,0 +1,40 @@
+""" Alexandre Hachet
+
+Serveur HTTP local exposant les statistiques de commandes (instrument.CommandStats) au
+format texte Prometheus. Module séparé pour que http.server ne soit chargé que si le
+serveur est démarré.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    Serves CommandStats.prometheus() on http://host:port/metrics from a daemon thread.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, stats, host="127.0.0.1", port=9108):
+        self.stats = stats
+        super().__init__((host, port), _MetricsHandler)
+        self.port = self.server_address[1]
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.stats.prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
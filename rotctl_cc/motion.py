@@ -0,0 +1,113 @@
+""" Alexandre Hachet
+
+Attente de fin de mouvement du rotor sans boucle active.
+
+Le rotor est interrogé selon un calendrier adaptatif : la vitesse de rotation observée
+entre deux lectures sert à prédire l'arrivée, et l'intervalle d'interrogation est
+allongé tant que la cible est loin. L'attente tourne dans un thread et renvoie un Future.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StallError(Exception):
+    """
+    The rotator position stopped changing before the target was reached.
+    """
+
+    def __init__(self, pos, remaining):
+        super().__init__(f"Rotator stalled at {pos}, {remaining:.2f} deg from target")
+        self.pos = pos
+        self.remaining = remaining
+
+
+class PollSchedule:
+    """
+    Adaptive polling interval from the observed slew rate.
+    Polls halfway to the predicted arrival, doubles the interval while the rate is unknown,
+    and flags a stall when the position has not changed for 'stall_time' seconds.
+    """
+
+    def __init__(self, min_interval=0.1, max_interval=2.0, stall_time=5.0, still_eps=0.05):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stall_time = stall_time
+        self.still_eps = still_eps
+        self.rate = None
+        self.delay = min_interval
+        self.last = None
+        self.still_since = None
+        self.stalled = False
+
+    def update(self, t, pos, remaining):
+        """
+        Feed one (time, position, remaining distance) sample, return the delay before the next poll.
+        """
+        if self.last is not None:
+            last_t, last_pos = self.last
+            moved = math.hypot(pos[0] - last_pos[0], pos[1] - last_pos[1])
+            dt = t - last_t
+            if moved > self.still_eps and dt > 0:
+                inst = moved / dt
+                self.rate = inst if self.rate is None else 0.5 * (self.rate + inst)
+                self.still_since = None
+            else:
+                if self.still_since is None:
+                    self.still_since = last_t
+                self.stalled = t - self.still_since >= self.stall_time
+        self.last = (t, pos)
+
+        if self.rate and self.still_since is None:
+            self.delay = 0.5 * remaining / self.rate
+        else:
+            self.delay = 2 * self.delay
+        self.delay = min(max(self.delay, self.min_interval), self.max_interval)
+        return self.delay
+
+
+class MotionWatcher:
+    """
+    Watch the rotator until a motion completes and resolve a Future.
+    'poll' is a callable returning the current (az, el) tuple.
+    """
+
+    def __init__(self, poll, eps=1, min_interval=0.1, max_interval=2.0, stall_time=5.0, workers=2):
+        self.poll = poll
+        self.eps = eps
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stall_time = stall_time
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="motion")
+
+    def watch(self, remaining, timeout=None, then=None, eps=None):
+        """
+        Return a Future resolved with the final position once remaining(pos) <= eps (self.eps by default).
+        The Future raises TimeoutError after 'timeout' seconds and StallError if the rotator stops moving.
+        'then' is called when the watch ends, whatever the outcome (typically rot.stop).
+        """
+        eps = self.eps if eps is None else eps
+        return self.executor.submit(self._watch, remaining, timeout, then, eps)
+
+    def _watch(self, remaining, timeout, then, eps):
+        schedule = PollSchedule(self.min_interval, self.max_interval, self.stall_time)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                pos = self.poll()
+                now = time.monotonic()
+                left = remaining(pos)
+                if left <= eps:
+                    return pos
+                delay = schedule.update(now, pos, left)
+                if schedule.stalled:
+                    raise StallError(pos, left)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError(f"Rotator did not reach target within {timeout} s")
+                    delay = min(delay, deadline - now)
+                time.sleep(delay)
+        finally:
+            if then is not None:
+                then()
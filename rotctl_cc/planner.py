@@ -0,0 +1,209 @@
+""" Alexandre Hachet
+
+Planification des mouvements du rotor pour un passage.
+
+SlewModel apprend la vitesse de chaque axe et la latence de commande à partir des positions
+lues (get_pos) ; la latence est mesurée par une courte rafale de lectures juste après une
+commande envoyée au rotor immobile. Planner en déduit une suite de commandes pour un passage :
+- choix du tour d'azimuth dans la plage du rotor (-180..540 par exemple) ;
+- retournement ("flip") pour les passages au zénith si l'élévation va jusqu'à 180° ;
+- sinon limitation de la vitesse d'azimuth autour du trou de zénith (keyhole), en partant en avance ;
+- commandes en avance de phase (latence + demi bande morte), envoyées seulement quand la cible
+  s'éloigne de plus d'une bande morte : moins de commandes et moins d'erreur de pointage.
+"""
+
+import time
+import numpy as np
+from .rotctl import tools
+
+
+class SlewModel:
+    """
+    Per-axis slew rate (deg/s) and command latency (s) learned from get_pos samples.
+    """
+
+    def __init__(self, az_rate=6.0, el_rate=6.0, latency=0.5, alpha=0.2, still_eps=0.05, max_gap=1.0):
+        """
+        'max_gap' bounds the time between the samples around the start of motion for a latency measurement.
+        """
+        self.az_rate = az_rate
+        self.el_rate = el_rate
+        self.latency = latency
+        self.alpha = alpha
+        self.still_eps = still_eps
+        self.max_gap = max_gap
+        self.last = None
+        # Last Position object observed: a cached get_pos answer is the same object
+        self.reading = None
+        self.moving = None
+        self.pending = None
+
+    def command(self, t, az, el):
+        """
+        Record a command sent at time 't' (monotonic seconds). Only a command sent while the last
+        samples showed the rotator still can time the start of motion.
+        """
+        self.pending = t if self.moving is False else None
+
+    def observe(self, t, az, el):
+        """
+        Record a measured position at time 't'. Rates are learned on samples where the axis moves,
+        the latency is the delay between a command and the first sample showing motion, when the
+        previous sample (or the command) is less than 'max_gap' seconds before it.
+        """
+        if self.last is not None:
+            last_t, last_az, last_el = self.last
+            dt = t - last_t
+            d_az = abs((az - last_az + 180) % 360 - 180)
+            d_el = abs(el - last_el)
+            if dt > 0:
+                # Only samples near full speed say something about the maximum rate
+                if d_az / dt > 0.5 * self.az_rate:
+                    self.az_rate += self.alpha * (d_az / dt - self.az_rate)
+                if d_el / dt > 0.5 * self.el_rate:
+                    self.el_rate += self.alpha * (d_el / dt - self.el_rate)
+                # Samples far apart do not say whether the rotator is still now
+                self.moving = max(d_az, d_el) > self.still_eps if dt <= self.max_gap else None
+                if self.pending is not None and self.moving:
+                    # Motion started between the later of the command and the previous sample, and t
+                    start = max(last_t, self.pending)
+                    if t - start <= self.max_gap:
+                        lat = (start + t) / 2 - self.pending
+                        self.latency += self.alpha * (lat - self.latency)
+                    self.pending = None
+        self.last = (t, az, el)
+
+
+class Plan:
+    """
+    Commands for one pass: send times (unix) and rotator-frame az/el (az may exceed 360, el 90 when flipped).
+    """
+
+    def __init__(self, t, az, el, flipped=False):
+        self.t = t
+        self.az = az
+        self.el = el
+        self.flipped = flipped
+
+    def __len__(self):
+        return len(self.t)
+
+    def execute(self, rot, model=None, observe_every=5.0, running=lambda: True, burst=10, burst_period=0.02):
+        """
+        Send each command at its time. Every 'observe_every' seconds the model is updated: the position
+        is read twice 'burst_period' apart before the command, then up to 'burst' times every
+        'burst_period' seconds after it until the motion shows (or the next command is due).
+        """
+        next_obs = 0.0
+        times = self.t.tolist()
+        for k, (t, az, el) in enumerate(zip(times, self.az.tolist(), self.el.tolist())):
+            if not running():
+                break
+            probe = model is not None and time.monotonic() >= next_obs
+            if probe:
+                time.sleep(max(t - burst_period - time.time(), 0))
+                self._observe(rot, model)
+            delay = t - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            if probe:
+                self._observe(rot, model)
+            # The latency counts from the call: it includes the command round trip
+            sent = time.monotonic()
+            rot.set_pos(round(az, 2), round(el, 2), wait=False)
+            if model is None:
+                continue
+            model.command(sent, az, el)
+            if probe:
+                due = times[k + 1] if k + 1 < len(times) else time.time() + burst * burst_period
+                for i in range(burst):
+                    if model.pending is None or time.time() + burst_period >= due:
+                        break
+                    time.sleep(burst_period)
+                    self._observe(rot, model)
+                next_obs = time.monotonic() + observe_every
+
+    @staticmethod
+    def _observe(rot, model):
+        # Fresh reading: a cached one would look still and then pile its age onto the next dt
+        pos = rot.get_pos(max_age=0)
+        if pos is False or pos is model.reading:
+            return
+        model.reading = pos
+        model.observe(time.monotonic(), *tools.parse_pos(pos))
+
+
+class Planner:
+
+    def __init__(self, model=None, az_min=-180.0, az_max=540.0, el_max=90.0, flip_el=75.0, deadband=0.5, max_lead=10.0):
+        """
+        'az_min'/'az_max'/'el_max' are the rotator limits (el_max=180 allows the overhead flip above 'flip_el').
+        'deadband' is the tolerated pointing error in degrees.
+        """
+        self.model = model or SlewModel()
+        self.az_min = az_min
+        self.az_max = az_max
+        self.el_max = el_max
+        self.flip_el = flip_el
+        self.deadband = deadband
+        self.max_lead = max_lead
+
+    def plan(self, t, az, el, current_az=0.0):
+        """
+        Plan the commands for a pass sampled at unix times 't' (az unwrapped, degrees).
+        'current_az' is the rotator azimuth before the pass, used to pick the azimuth turn.
+        """
+        t = np.asarray(t, dtype=np.float64)
+        az = np.asarray(az, dtype=np.float64)
+        el = np.asarray(el, dtype=np.float64)
+        flipped = el.max() > self.flip_el and self.el_max >= 180
+        if flipped:
+            az, el = az + 180.0, 180.0 - el
+
+        az = self._choose_turn(az, current_az)
+        # Keyhole: an overhead pass asks for more azimuth speed than the rotator has
+        az = self._rate_limit(t, az, self.model.az_rate)
+
+        # Lead: send at t the position the target reaches after the latency plus half a deadband
+        speed = np.hypot(np.gradient(az, t) * np.cos(np.radians(np.minimum(el, 180 - el))), np.gradient(el, t))
+        lead = self.model.latency + np.clip(0.5 * self.deadband / np.maximum(speed, 1e-6), 0, self.max_lead)
+        lead_az = np.interp(t + lead, t, az)
+        lead_el = np.interp(t + lead, t, el)
+
+        keep = [0]
+        for i in range(1, len(t)):
+            j = keep[-1]
+            if abs(az[i] - lead_az[j]) > self.deadband or abs(el[i] - lead_el[j]) > self.deadband:
+                keep.append(i)
+        keep = np.array(keep)
+        return Plan(t[keep], lead_az[keep], lead_el[keep], flipped)
+
+    def _choose_turn(self, az, current_az):
+        # Shift by k * 360 so the whole pass fits the rotator range, closest to the current azimuth
+        best = None
+        for k in range(-3, 4):
+            shifted = az + 360.0 * k
+            if shifted.min() < self.az_min or shifted.max() > self.az_max:
+                continue
+            cost = abs(shifted[0] - current_az)
+            if best is None or cost < best[0]:
+                best = (cost, shifted)
+        if best is None:
+            # No turn fits the whole pass: start closest to the current azimuth and clip at the limits
+            shifted = az + 360.0 * np.round((current_az - az[0]) / 360.0)
+            return np.clip(shifted, self.az_min, self.az_max)
+        return best[1]
+
+    @staticmethod
+    def _rate_limit(t, x, rate):
+        """
+        Closest feasible path at 'rate' deg/s: average of a forward-limited (lagging) and a
+        backward-limited (leading) copy, so the azimuth swing starts early and ends late.
+        """
+        dt = np.diff(t) * rate
+        fwd, bwd = x.copy(), x.copy()
+        for i in range(1, len(x)):
+            fwd[i] = min(max(fwd[i], fwd[i - 1] - dt[i - 1]), fwd[i - 1] + dt[i - 1])
+        for i in range(len(x) - 2, -1, -1):
+            bwd[i] = min(max(bwd[i], bwd[i + 1] - dt[i]), bwd[i + 1] + dt[i])
+        return 0.5 * (fwd + bwd)
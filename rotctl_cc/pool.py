@@ -0,0 +1,157 @@
+""" Alexandre Hachet
+
+Gestion de plusieurs rotors d'une station.
+
+RotatorPool ouvre N connexions (rotctl série ou rotctld), envoie les commandes à tous
+les rotors en parallèle et garde pour chacun des statistiques de santé et de latence.
+L'arrêt d'urgence passe par un pool de threads séparé et se termine en un temps borné,
+quel que soit le nombre de rotors.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from .rotctl import ROTCTL
+from .rotctld import ROTCTLD
+
+
+def open_rotator(spec):
+    """
+    Open a rotator from a spec dict:
+    {"host": "localhost", "port": 4533} for rotctld, {"model": 1, "device": "/dev/ttyUSB0"} for rotctl,
+    {"sim": {...}} for a simulated rotator (simulator.open_sim parameters).
+    With "supervise": true the connection is wrapped in a supervisor.SupervisedRotator (reconnects).
+    """
+    spec = dict(spec)
+    spec.pop("name", None)
+    if spec.pop("supervise", False):
+        from .supervisor import SupervisedRotator
+        return SupervisedRotator(lambda: open_rotator(spec))
+    if "sim" in spec:
+        from .simulator import open_sim
+        return open_sim(**(spec["sim"] or {}))
+    if "host" in spec:
+        return ROTCTLD(**spec)
+    return ROTCTL(**spec)
+
+
+class RotatorStats:
+    """
+    Call counts and latency for one rotator, per method.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.errors = 0
+        self.timeouts = 0
+        self.last_ok = None
+        self.last_error = None
+        self.ok = False
+
+    def record(self, method, latency, ok, error=None):
+        with self.lock:
+            count, total, worst = self.calls.get(method, (0, 0.0, 0.0))
+            self.calls[method] = (count + 1, total + latency, max(worst, latency))
+            self.ok = ok
+            if ok:
+                self.last_ok = time.time()
+            else:
+                self.errors += 1
+                self.last_error = error
+
+    def timeout(self):
+        with self.lock:
+            self.timeouts += 1
+            self.last_error = "timeout"
+            self.ok = False
+
+    @property
+    def healthy(self):
+        # Healthy if the last call on this rotator succeeded
+        return self.ok
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                "healthy": self.healthy,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "last_ok": self.last_ok,
+                "last_error": None if self.last_error is None else str(self.last_error),
+                "methods": {m: {"count": c, "mean_s": t / c, "max_s": w} for m, (c, t, w) in self.calls.items()},
+            }
+
+
+class RotatorPool:
+
+    def __init__(self, rotators):
+        """
+        'rotators' maps a name to a ROTCTL/ROTCTLD instance or to a spec dict for open_rotator.
+        """
+        self.rotators = {name: open_rotator(r) if isinstance(r, dict) else r for name, r in rotators.items()}
+        self.stats = {name: RotatorStats() for name in self.rotators}
+        n = max(len(self.rotators), 1)
+        self.executor = ThreadPoolExecutor(max_workers=2 * n, thread_name_prefix="pool")
+        # Stops never queue behind a slow set_pos
+        self.estop_executor = ThreadPoolExecutor(max_workers=n, thread_name_prefix="pool-estop")
+
+    def __getitem__(self, name):
+        return self.rotators[name]
+
+    def _call(self, name, method, *args):
+        start = time.perf_counter()
+        try:
+            out = getattr(self.rotators[name], method)(*args)
+        except Exception as e:
+            self.stats[name].record(method, time.perf_counter() - start, False, e)
+            raise
+        ok = out is not False
+        self.stats[name].record(method, time.perf_counter() - start, ok, None if ok else f"{method} failed")
+        return out
+
+    def fanout(self, method, *args, timeout=None, executor=None):
+        """
+        Call 'method' on every rotator concurrently.
+        Returns {name: result}; the result is the exception instance on error and TimeoutError if
+        the call did not finish within 'timeout' seconds (the call keeps running in the background).
+        """
+        executor = executor or self.executor
+        futures = {name: executor.submit(self._call, name, method, *args) for name in self.rotators}
+        done, _ = wait(futures.values(), timeout=timeout)
+
+        out = {}
+        for name, fut in futures.items():
+            if fut in done:
+                out[name] = fut.exception() or fut.result()
+            else:
+                self.stats[name].timeout()
+                out[name] = TimeoutError(f"{method} on '{name}' did not finish within {timeout} s")
+        return out
+
+    def set_pos(self, az, el, timeout=None):
+        return self.fanout("set_pos", az, el, timeout, timeout=timeout)
+
+    def get_pos(self, timeout=None):
+        return self.fanout("get_pos", timeout=timeout)
+
+    def stop(self, timeout=None):
+        return self.fanout("stop", timeout=timeout)
+
+    def park(self, timeout=None):
+        return self.fanout("park", timeout=timeout)
+
+    def emergency_stop(self, timeout=1.0):
+        """
+        Send 'S' to every rotator at once and return within 'timeout' seconds.
+        Returns {name: result} like fanout, rotators that did not answer in time map to TimeoutError.
+        """
+        return self.fanout("stop", timeout=timeout, executor=self.estop_executor)
+
+    def health(self):
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+    def exit(self):
+        self.fanout("exit", timeout=5)
+        self.executor.shutdown(wait=False)
+        self.estop_executor.shutdown(wait=False)
@@ -0,0 +1,466 @@
+""" Alexandre Hachet
+
+Classe qui fait l'interface entre python et la librairie ROTCTL.
+Documentation reprise depuis celle de la librairie ROTCTL.
+Les conversions de coordonnées (L, l, D, d, E, e, B, A, a) sont calculées localement par
+locator.py, sans passer par rotctl.
+
+Commands (some may not be available for this rotator):
+P: set_pos     (Azimuth, Elevation)
+p: get_pos     ()
+K: park        ()
+S: stop        ()
+R: reset       (Reset)
+M: move        (Direction, Speed)
+V: set_level   (Level, Level Value)
+v: get_level   (Level)
+U: set_func    (Func, Func Status)
+u: get_func    (Func)
+X: set_parm    (Parm, Parm Value)
+x: get_parm    (Parm)
+C: set_conf    (Token, Value)
+_: get_info    ()
+s: get_status  ()
+w: send_cmd    (Cmd)
+1: dump_caps   ()
+3: dump_conf   ()
+?: dump_state  ()
+L: lonlat2loc  (Longitude, Latitude, Loc Len [2-12])
+l: loc2lonlat  (Locator)
+D: dms2dec     (Degrees, Minutes, Seconds, S/W)
+d: dec2dms     (Dec Degrees)
+E: dmmm2dec    (Degrees, Dec Minutes, S/W)
+e: dec2dmmm    (Dec Deg)
+B: qrb         (Lon 1, Lat 1, Lon 2, Lat 2)
+A: a_sp2a_lp   (Short Path Deg)
+a: d_sp2d_lp   (Short Path km)
+?: pause       (Seconds)
+?: get_conf    (Token)
+"""
+
+import pexpect
+import threading
+import time
+import math
+from . import hamlib
+from .instrument import CommandStats
+from .motion import MotionWatcher
+
+class ROTCTL:
+
+    # @move parameters
+    UP = "2"
+    DOWN = "4"
+    LEFT = "8"
+    RIGHT = "16"
+
+    # S/W paramaters
+    NORTH_EAST = "0"
+    SOUTH_WEST = "1"
+
+    # Precision parameter
+    EPS = 1
+
+    # get_pos answers from cache when the last reading is younger than this (seconds)
+    POS_MAX_AGE = 0.2
+
+    # telemetry.TelemetryRecorder, set on an instance to record every command
+    telemetry = None
+
+    # Last exception raised by a command (methods returning False keep the cause here)
+    last_error = None
+
+    def __init__(self, model=1, device="/dev/ttyUSB0", timeout=3):
+        cmd = f"rotctl -m {model} -r {device}"
+        # No terminal echo: answers are read in extended response mode, nothing to strip
+        self.child = pexpect.spawn(cmd, encoding="utf-8", timeout=timeout, echo=False)
+        try:
+            self.child.expect(r"Rotator command:\s*", timeout=timeout)
+        except (pexpect.TIMEOUT, pexpect.EOF):
+            self.child.close(force=True)
+            raise ConnectionError(f"Error while connecting to the rotor ({cmd})")
+        self._setup()
+
+    def _setup(self):
+        # One command at a time on the child: GUI threads, motion watchers and trackers share it
+        self.lock = threading.RLock()
+        self.motion = MotionWatcher(self._poll_pos, eps=self.EPS)
+        self.stats = CommandStats()
+        # pre(command) and post(command, latency, result, error) callables run around every command
+        self.pre_hooks = []
+        self.post_hooks = []
+        # Shared position cache: (monotonic time of the answer, answer), one 'p' in flight at most
+        self.pos_max_age = self.POS_MAX_AGE
+        self.pos_cond = threading.Condition()
+        self.pos_cache = None
+        self.pos_inflight = False
+        self.pos_gen = 0
+
+    def is_alive(self):
+        """
+        False once the rotctl child has exited (rotctl crash, serial adapter gone).
+        """
+        return self.child.isalive()
+
+    def __str__(self):
+        return self._get_info()
+
+    def send(self, command, timeout=3):
+        """
+        Send messages through the child process.
+        Thread-safe: concurrent callers are serialized on self.lock.
+        Returns the value lines joined by '\r\n', raises a hamlib.HamlibError for a non-zero RPRT code.
+        """
+        with self.lock:
+            return "\r\n".join(self._call(command, timeout))
+
+    def _call(self, command, timeout, send=None):
+        # 'send' replaces self._send for this command (get_pos decodes its answer in one pass)
+        for hook in self.pre_hooks:
+            hook(command)
+        start = time.perf_counter()
+        try:
+            out = (send or self._send)(command, timeout)
+        except Exception as e:
+            self._observe(command, time.perf_counter() - start, None, e)
+            raise
+        self._observe(command, time.perf_counter() - start, out, None)
+        return out
+
+    def _observe(self, command, latency, out, error):
+        timeout = isinstance(error, (pexpect.TIMEOUT, TimeoutError))
+        if error is not None:
+            self.last_error = error
+        self.stats.observe(command.split(" ", 1)[0], latency, error, timeout)
+        if self.telemetry is not None and error is None:
+            self._record(command, latency, out)
+        for hook in self.post_hooks:
+            hook(command, latency, out, error)
+
+    def add_hook(self, pre=None, post=None):
+        """
+        Register profiling hooks: pre(command) before sending, post(command, latency, result, error) after.
+        """
+        if pre is not None:
+            self.pre_hooks.append(pre)
+        if post is not None:
+            self.post_hooks.append(post)
+
+    def serve_metrics(self, host="127.0.0.1", port=9108):
+        """
+        Serve the command stats in Prometheus text format on http://host:port/metrics.
+        """
+        from .metrics import MetricsServer
+        return MetricsServer(self.stats, host, port)
+
+    def _record(self, command, latency, out):
+        target = pos = (math.nan, math.nan)
+        if command.startswith("P "):
+            target = tuple(float(x) for x in command.split()[1:3])
+        elif command == "p":
+            pos = out if isinstance(out, tuple) else hamlib.parse_pos(out)
+        self.telemetry.record(command, latency, target, pos)
+
+    def send_many(self, commands, timeout=3):
+        """
+        Send several commands back to back while holding the lock.
+        Returns one result per command, the exception instance if that command failed.
+        """
+        out = []
+        with self.lock:
+            for command in commands:
+                try:
+                    out.append("\r\n".join(self._call(command, timeout)))
+                except Exception as e:
+                    out.append(e)
+        return out
+
+    def _send(self, command, timeout):
+        # Extended response mode: "name:", value lines, "RPRT n"; returns the value lines
+        self.child.sendline("+" + command)
+        self.child.expect(r"Rotator command:\s*", timeout=timeout)
+        return hamlib.parse_block(command, self.child.before)
+
+    def _send_pos(self, command, timeout):
+        # _send for 'p', returns the Position
+        self.child.sendline("+" + command)
+        self.child.expect(r"Rotator command:\s*", timeout=timeout)
+        return hamlib.parse_pos_block(command, self.child.before)
+    
+    def set_pos(self, az, el, timeout=None, wait=True):
+        """
+        Set position.
+        'Azimuth' and 'Elevation' are floating point values.
+        Azimuth can be -180 to 540 depending on the rotator to allow for rotators facing south and the capabilities of the rotator.
+        Elevation can be -20 to 210 depending on the rotator.
+        For example:
+        P 163.0 41.0
+        Note: If the rotator does not support setting elevation (most do not) supply “0.0” for 'Elevation'.
+        Blocks until the rotator reaches the position, stalls or 'timeout' seconds elapse.
+        With wait=False the command is only sent (trackers re-commanding the target every tick).
+        """
+        try:
+            a = self.send(f"P {az} {el}")
+            if wait:
+                self._wait_pos(az, el, timeout).result()
+            return a
+        except Exception:
+            return False
+
+    def set_pos_async(self, az, el, timeout=None):
+        """
+        Non-blocking set_pos.
+        Returns a Future resolved with the final (az, el) position, raising TimeoutError or motion.StallError.
+        """
+        self.send(f"P {az} {el}")
+        return self._wait_pos(az, el, timeout)
+
+    def _wait_pos(self, az, el, timeout):
+        return self.motion.watch(lambda pos: tools.dist4tuple((az, el), pos), timeout, then=self.stop)
+
+    def _poll_pos(self):
+        return tools.parse_pos(self.get_pos())
+
+    def get_pos(self, max_age=None):
+        """
+        Get position.
+        'Azimuth' and 'Elevation' are returned as double precision floating point values.
+        Returns a hamlib.Position(az, el), False if the rotator did not answer.
+        A reading younger than 'max_age' seconds (self.pos_max_age by default) is served from cache,
+        and callers arriving while a 'p' is in flight share its answer instead of sending another one.
+        """
+        max_age = self.pos_max_age if max_age is None else max_age
+        with self.pos_cond:
+            gen = None
+            while True:
+                # Fresh enough, or answered by the request we were waiting on
+                if self.pos_cache is not None:
+                    if time.monotonic() - self.pos_cache[0] <= max_age or (gen is not None and gen != self.pos_gen):
+                        return self.pos_cache[1]
+                if not self.pos_inflight:
+                    break
+                gen = self.pos_gen
+                self.pos_cond.wait()
+            self.pos_inflight = True
+
+        try:
+            with self.lock:
+                out = self._call("p", 3, self._send_pos)
+        except Exception:
+            out = False
+
+        with self.pos_cond:
+            self.pos_inflight = False
+            if out is not False:
+                self.pos_cache = (time.monotonic(), out)
+                self.pos_gen += 1
+            self.pos_cond.notify_all()
+        return out
+
+    def move(self, dir, speed, step=EPS, timeout=None):
+        """
+        Move the rotator in a specific direction at the given rate.
+        'Direction' is an integer or keyword defined as '2' = UP, '4' = DOWN, '8' = LEFT or CCW and '16' = RIGHT or CW
+        'Speed' is an integer between 1 and 100. Use -1 for no change to current speed.
+        Note: Not all backends that implement the move command use the Speed value.
+        The rotator is stopped once it has moved by 'step' degrees.
+        """
+        try:
+            start_pos = self._poll_pos()
+            a = self.send(f"M {dir} {speed}")
+            self._wait_move(start_pos, step, timeout).result()
+            return a
+        except Exception:
+            return False
+
+    def move_async(self, dir, speed, step=EPS, timeout=None):
+        """
+        Non-blocking move.
+        Returns a Future resolved with the final (az, el) position once the rotator has moved by 'step' degrees.
+        """
+        start_pos = self._poll_pos()
+        self.send(f"M {dir} {speed}")
+        return self._wait_move(start_pos, step, timeout)
+
+    def _wait_move(self, start_pos, step, timeout):
+        return self.motion.watch(lambda pos: step - tools.dist4tuple(start_pos, pos), timeout, then=self.stop, eps=0)
+
+    def stop(self):
+        """
+        Stop the rotator
+        """
+        try:
+            return self.send("S")
+        except Exception:
+            return False
+        
+    def park(self):
+        """
+        Park the rotator
+        """
+        try:
+            return self.send("K")
+        except Exception:
+            return False
+        
+    def _get_info(self):
+        """
+        Get miscellaneous information about the rotator.
+        Returns 'Info' “Model Name” at present.
+        """
+        try:
+            return self.send("_")
+        except Exception:
+            return False
+
+    def exit(self):
+        """
+        Exit rotctl in interactive mode.
+        When rotctl is controlling the rotator directly, will close the rotator backend and port. 
+        When rotctl is connected to rotctld (rotator model 2), the TCP/IP connection to rotctld is closed and rotctld remains running, available for another TCP/IP network connection.
+        """
+        try:
+            self.child.sendline("q")
+        except Exception:
+            pass
+        self.child.close()
+
+    def lonlat2loc(self, long, lat, loc_len):
+        """
+        Returns the Maidenhead 'Locator' for the given 'Longitude' and 'Latitude'.
+        Floating point values are supplied. The precision of the returned square is controlled by 'Loc Len' which should be an even numbered integer value between 2 and 12.
+        For example:
+        lonlat2loc(-170.0, -85.0, 12)
+        returns:
+        'AA55AA00AA00'
+        """
+        try:
+            from .locator import lonlat2loc
+            return lonlat2loc(long, lat, loc_len)
+        except Exception:
+            return False
+        
+    def loc2lonlat(self, locator):
+        """
+        Returns 'Longitude' and 'Latitude' in decimal degrees at the approximate center of the requested Maidenhead grid square.
+        'Locator' can be from 2 to 12 characters in length.
+        West longitude is expressed as a negative value.
+        South latitude is expressed as a negative value.
+        For example:
+        loc2lonlat("AA55AA00AA00")
+        returns:
+        (-169.999983, -84.999991)
+        """
+        try:
+            from .locator import loc2lonlat
+            return loc2lonlat(locator)
+        except Exception:
+            return False
+        
+    def dms2dec(self, deg, min, sec, S_W):
+        """
+        Returns 'Dec Degrees', a signed floating point value.
+        'Degrees' and 'Minutes' are integer values.
+        'Seconds' is a floating point value.
+        'S/W' is a flag with '1' indicating South latitude or West longitude and '0' North or East (the flag is needed as computers don't recognize a signed zero even though only
+          the 'Degrees' value is typically signed in DMS notation).
+        """
+        try:
+            from .locator import dms2dec
+            return dms2dec(deg, min, sec, S_W)
+        except Exception:
+            return False
+        
+    def dec2dms(self, dec_deg):
+        """
+        Returns 'Degrees' 'Minutes' 'Seconds' 'S/W'.
+        Values are as in dms2dec above.
+        """
+        try:
+            from .locator import dec2dms
+            return dec2dms(dec_deg)
+        except Exception:
+            return False
+        
+    def dmmm2dec(self, deg, dec_min, S_W):
+        """
+        Returns 'Dec Degrees', a signed floating point value.
+        'Degrees' is an integer value.
+        'Dec Minutes' is a floating point value.
+        'S/W' is a flag as in dms2dec above.
+        """
+        try:
+            from .locator import dmmm2dec
+            return dmmm2dec(deg, dec_min, S_W)
+        except Exception:
+            return False
+        
+    def dec2dmmm(self, dec_deg):
+        """
+        Returns 'Degrees' 'Minutes' 'S/W'.
+        Values are as in dmmm2dec above.
+        """
+        try:
+            from .locator import dec2dmmm
+            return dec2dmmm(dec_deg)
+        except Exception:
+            return False
+        
+    def qrb(self, lon1, lat1, lon2, lat2):
+        """
+        Returns 'Distance' and 'Azimuth'.
+        'Distance' is in km.
+        'Azimuth' is in degrees.
+        """
+        try:
+            from .locator import qrb
+            return qrb(lon1, lat1, lon2, lat2)
+        except Exception:
+            return False
+        
+    def a_sp2a_lp(self, short_path_deg):
+        """
+        Returns 'Long Path Deg'.
+        Both the supplied argument and returned value are floating point values within the range of 0.00 to 360.00.
+        Note: Supplying a negative value will return an error message.
+        """
+        try:
+            from .locator import azimuth_long_path
+            return azimuth_long_path(short_path_deg)
+        except Exception:
+            return False
+        
+    def d_sp2d_lp(self, short_path_km):
+        """
+        Returns 'Long Path km'.
+        Both the supplied argument and returned value are floating point values.
+        """
+        try:
+            from .locator import distance_long_path
+            return distance_long_path(short_path_km)
+        except Exception:
+            return False
+        
+    def pause(self, sec):
+        """
+        Pause for the given whole (integer) number of 'Seconds' before sending the next command to the rotator.
+        """
+        try:
+            return self.send(f"pause {sec}")
+        except Exception:
+            return False
+
+
+class tools:
+    
+    @staticmethod
+    def parse_pos(res):
+        # get_pos already returns a Position; text answers are still accepted
+        if isinstance(res, tuple):
+            return res
+        return hamlib.parse_pos_text(res)
+    
+    @staticmethod
+    def dist4tuple(a, b):
+        # use math.hypot for a correct Euclidean distance (avoid operator-precedence bugs)
+        return math.hypot(a[0] - b[0], a[1] - b[1])
\ No newline at end of file
@@ -0,0 +1,118 @@
+""" Alexandre Hachet
+
+Transport réseau vers rotctld (protocole TCP de Hamlib) avec la même interface que ROTCTL.
+Une seule socket persistante, pas de processus fils ni de pty.
+
+Les commandes sont envoyées en mode de réponse étendu ("+p", "+P az el", ...) :
+
+    +p
+    get_pos:
+    Azimuth: 180.000000
+    Elevation: 45.000000
+    RPRT 0
+
+Le code RPRT est lu à chaque réponse, un code non nul lève l'exception hamlib.HamlibError
+correspondant au code (RotctldError est conservé comme alias).
+"""
+
+import socket
+import time
+from . import hamlib
+from .rotctl import ROTCTL
+
+RotctldError = hamlib.HamlibError
+
+
+class ROTCTLD(ROTCTL):
+
+    def __init__(self, host="localhost", port=4533, timeout=3):
+        self.host = host
+        self.port = port
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.sock.makefile("rb")
+        self.alive = True
+        self._setup()
+
+    def is_alive(self):
+        """
+        False once the connection failed: closed by rotctld, reset, or a timeout that leaves the
+        answer stream out of step.
+        """
+        return self.alive
+
+    def _send(self, command, timeout):
+        """
+        Send a command in extended response mode and return its value lines.
+        """
+        try:
+            self.sock.settimeout(timeout)
+            self.sock.sendall(f"+{command}\n".encode("utf-8"))
+            return self._recv(command)
+        except hamlib.HamlibError:
+            raise
+        except OSError:
+            self.alive = False
+            raise
+
+    def _send_pos(self, command, timeout):
+        return hamlib.parse_pos(self._send(command, timeout))
+
+    def send_many(self, commands, timeout=3):
+        """
+        Pipelined send: all commands are written in one go, then the responses are read in order.
+        Returns one result per command, the exception instance if that command failed.
+        """
+        out = []
+        with self.lock:
+            for command in commands:
+                for hook in self.pre_hooks:
+                    hook(command)
+            start = time.perf_counter()
+            try:
+                self.sock.settimeout(timeout)
+                self.sock.sendall("".join(f"+{c}\n" for c in commands).encode("utf-8"))
+                # Latency of a pipelined command: from the batch write to its response
+                for command in commands:
+                    try:
+                        values = self._recv(command)
+                        self._observe(command, time.perf_counter() - start, values, None)
+                        out.append("\r\n".join(values))
+                    except RotctldError as e:
+                        self._observe(command, time.perf_counter() - start, None, e)
+                        out.append(e)
+            except OSError:
+                self.alive = False
+                raise
+        return out
+
+    def _recv(self, command):
+        # First line is the echoed command name ("get_pos:"), then values until "RPRT n"
+        values = []
+        line = self._readline()
+        while not line.startswith("RPRT "):
+            values.append(line)
+            line = self._readline()
+
+        code = int(line[5:])
+        if code != 0:
+            raise hamlib.error(command, code)
+        return values[1:]
+
+    def _readline(self):
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("rotctld closed the connection")
+        return line.decode("utf-8").strip()
+
+    def exit(self):
+        """
+        Close the TCP connection, rotctld keeps running for another client.
+        """
+        self.alive = False
+        try:
+            self.sock.sendall(b"q\n")
+        except Exception:
+            pass
+        self.rfile.close()
+        self.sock.close()
@@ -0,0 +1,129 @@
+""" Alexandre Hachet
+
+Planification des passages pour tout un catalogue de satellites.
+
+Les passages de tous les satellites sur la fenêtre sont calculés en lot : une seule grille
+de temps grossière partagée, un appel altaz() vectorisé par satellite, puis interpolation
+des passages à l'horizon. Les conflits sont résolus par priorité, en tenant compte du temps
+de rotation entre la fin d'un passage et le début du suivant. La chronologie obtenue pilote
+le rotor passage par passage (trajectoire fine calculée juste avant chaque passage).
+"""
+
+import bisect
+import time
+import numpy as np
+from datetime import datetime, timezone
+from skyfield.api import load
+from .tle_follow import PassPredictor, track_pass
+
+
+class PassWindow:
+    """
+    Coarse pass of one satellite: unix times, max elevation and (az, el) at AOS and LOS.
+    """
+
+    def __init__(self, satellite, aos, tca, los, max_el, start, end, priority=0):
+        self.satellite = satellite
+        self.aos = aos
+        self.tca = tca
+        self.los = los
+        self.max_el = max_el
+        self.start = start
+        self.end = end
+        self.priority = priority
+
+    def __str__(self):
+        fmt = lambda t: datetime.fromtimestamp(t, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{self.satellite.name:<24} {fmt(self.aos)} -> {fmt(self.los)}  max el {self.max_el:5.1f}°  prio {self.priority}"
+
+
+class Scheduler:
+
+    def __init__(self, satellites, observer, ts=None, priorities=None, az_rate=6.0, el_rate=6.0, min_el=0.0, step=30.0):
+        """
+        'satellites' is a list of EarthSatellite, 'priorities' maps a name or NORAD id to an integer (higher wins).
+        'az_rate' and 'el_rate' are the rotator slew rates in deg/s, 'step' the coarse grid period in seconds.
+        """
+        self.satellites = satellites
+        self.observer = observer
+        self.ts = ts or load.timescale()
+        self.priorities = priorities or {}
+        self.az_rate = az_rate
+        self.el_rate = el_rate
+        self.min_el = min_el
+        self.step = step
+
+    def priority(self, satellite):
+        return self.priorities.get(satellite.name, self.priorities.get(satellite.model.satnum, 0))
+
+    def compute_passes(self, start=None, hours=24):
+        """
+        All passes of all satellites between 'start' (unix time, now by default) and start + hours.
+        Passes shorter than the grid step may be missed.
+        """
+        t0 = time.time() if start is None else start
+        grid = t0 + np.arange(0, hours * 3600 + self.step, self.step)
+        t = self.ts.utc(1970, 1, 1, 0, 0, grid)
+
+        out = []
+        for sat in self.satellites:
+            alt, az, _ = (sat - self.observer).at(t).altaz()
+            el, azd = alt.degrees, az.degrees
+            up = el > self.min_el
+            if not up.any():
+                continue
+
+            edges = np.flatnonzero(up[1:] != up[:-1])
+            starts = list(edges[~up[edges]] + 1)
+            ends = list(edges[up[edges]])
+            if up[0]:
+                starts.insert(0, 0)
+            if up[-1]:
+                ends.append(len(grid) - 1)
+
+            for s, e in zip(starts, ends):
+                aos = self._crossing(grid, el, s - 1) if s > 0 else grid[0]
+                los = self._crossing(grid, el, e) if e < len(grid) - 1 else grid[-1]
+                k = s + int(np.argmax(el[s:e + 1]))
+                out.append(PassWindow(sat, float(aos), float(grid[k]), float(los), float(el[k]),
+                                      (float(azd[s]), float(el[s])), (float(azd[e]), float(el[e])),
+                                      self.priority(sat)))
+
+        out.sort(key=lambda w: w.aos)
+        return out
+
+    def _crossing(self, grid, el, i):
+        # Linear interpolation of the horizon crossing between samples i and i + 1
+        return grid[i] + (grid[i + 1] - grid[i]) * (self.min_el - el[i]) / (el[i + 1] - el[i])
+
+    def slew_time(self, a, b):
+        daz = abs((b[0] - a[0] + 180) % 360 - 180)
+        return max(daz / self.az_rate, abs(b[1] - a[1]) / self.el_rate)
+
+    def timeline(self, passes):
+        """
+        Keep the passes by decreasing priority then max elevation, dropping those that overlap
+        an accepted pass once the slew from one to the other is accounted for.
+        """
+        accepted = []
+        for w in sorted(passes, key=lambda w: (-w.priority, -w.max_el)):
+            i = bisect.bisect([a.aos for a in accepted], w.aos)
+            if i > 0 and accepted[i - 1].los + self.slew_time(accepted[i - 1].end, w.start) > w.aos:
+                continue
+            if i < len(accepted) and w.los + self.slew_time(w.end, accepted[i].start) > accepted[i].aos:
+                continue
+            accepted.insert(i, w)
+        return accepted
+
+    def run(self, rot, timeline, period=1.0, planner=None):
+        """
+        Drive the rotator through the timeline, tracking each pass with tle_follow.track_pass.
+        """
+        for w in timeline:
+            if w.los < time.time():
+                continue
+            aos = max(w.aos, time.time())
+            predictor = PassPredictor(w.satellite, self.observer, self.ts)
+            p = predictor.sample(*(self.ts.utc(1970, 1, 1, 0, 0, x) for x in (aos, max(w.tca, aos), w.los)))
+            print(f"{w.satellite.name}: {p}")
+            track_pass(rot, p, period, planner)
@@ -0,0 +1,195 @@
+""" Alexandre Hachet
+
+Rotor simulé, pour tester et mesurer sans matériel.
+
+SimRotator modélise chaque axe (vitesse max, accélération, butées) et SimRotctld expose ce
+rotor avec le protocole réseau de rotctld (p, P, S, K, M, _ en mode normal ou étendu '+'),
+avec une latence de liaison série configurable. ROTCTLD s'y connecte comme à un vrai rotctld,
+et ROTCTL(model=2, device="127.0.0.1:port") aussi si rotctl est installé.
+
+python -m rotctl_cc.simulator [port]
+"""
+
+import math
+import socket
+import socketserver
+import sys
+import threading
+import time
+from .rotctld import ROTCTLD
+
+# Hamlib error codes
+RIG_EINVAL = -1
+RIG_ENIMPL = -4
+
+
+class Axis:
+
+    def __init__(self, rate, accel, lo, hi, pos=0.0):
+        self.rate = rate
+        self.accel = accel
+        self.lo = lo
+        self.hi = hi
+        self.pos = pos
+        self.vel = 0.0
+        self.target = None
+        self.drive = 0.0
+
+    def step(self, dt):
+        if self.target is not None:
+            err = self.target - self.pos
+            # Fastest speed that still lets the axis brake before the target
+            want = math.copysign(min(self.rate, math.sqrt(2 * self.accel * abs(err))), err)
+        else:
+            want = self.drive
+        dv = max(-self.accel * dt, min(self.accel * dt, want - self.vel))
+        self.vel += dv
+        self.pos += self.vel * dt
+        if self.target is not None and abs(self.target - self.pos) < 1e-3 and abs(self.vel) <= self.accel * dt:
+            self.pos, self.vel = self.target, 0.0
+        if not self.lo <= self.pos <= self.hi:
+            self.pos = max(self.lo, min(self.hi, self.pos))
+            self.vel = self.drive = 0.0
+
+
+class SimRotator:
+    """
+    Az/el rotator model. Rates in deg/s, accelerations in deg/s², limits in degrees.
+    """
+
+    def __init__(self, az_rate=6.0, el_rate=6.0, accel=12.0, az_limits=(-180.0, 540.0), el_limits=(0.0, 90.0),
+                 park=(0.0, 0.0), dt=0.01):
+        self.az = Axis(az_rate, accel, *az_limits)
+        self.el = Axis(el_rate, accel, *el_limits)
+        self.park_pos = park
+        self.dt = dt
+        self.lock = threading.Lock()
+        self.t = time.monotonic()
+
+    def _advance(self):
+        now = time.monotonic()
+        while self.t < now:
+            dt = min(self.dt, now - self.t)
+            self.az.step(dt)
+            self.el.step(dt)
+            self.t += dt
+
+    def get_pos(self):
+        with self.lock:
+            self._advance()
+            return self.az.pos, self.el.pos
+
+    def set_pos(self, az, el):
+        if not (self.az.lo <= az <= self.az.hi and self.el.lo <= el <= self.el.hi):
+            raise ValueError(f"Position {az} {el} out of limits")
+        with self.lock:
+            self._advance()
+            self.az.target, self.el.target = az, el
+
+    def stop(self):
+        with self.lock:
+            self._advance()
+            for axis in (self.az, self.el):
+                axis.target, axis.drive = None, 0.0
+
+    def park(self):
+        self.set_pos(*self.park_pos)
+
+    def move(self, direction, speed):
+        """
+        Hamlib move: direction 2 = UP, 4 = DOWN, 8 = LEFT (CCW), 16 = RIGHT (CW), speed 1-100.
+        """
+        with self.lock:
+            self._advance()
+            axis, sign = {2: (self.el, 1), 4: (self.el, -1), 8: (self.az, -1), 16: (self.az, 1)}[direction]
+            axis.target = None
+            axis.drive = sign * axis.rate * max(1, min(100, speed)) / 100
+
+
+class SimRotctldHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        rot = self.server.rotator
+        for raw in self.rfile:
+            line = raw.decode("utf-8").strip()
+            if not line:
+                continue
+            extended = line.startswith("+")
+            if extended:
+                line = line[1:]
+            cmd, *args = line.split()
+            if cmd in ("q", "Q"):
+                return
+            if self.server.latency:
+                time.sleep(self.server.latency)
+
+            values, code = [], 0
+            try:
+                if cmd == "p":
+                    az, el = rot.get_pos()
+                    name, values = "get_pos:", [f"Azimuth: {az:.6f}", f"Elevation: {el:.6f}"]
+                elif cmd == "P":
+                    name = f"set_pos: {args[0]} {args[1]}"
+                    rot.set_pos(float(args[0]), float(args[1]))
+                elif cmd == "S":
+                    name = "stop:"
+                    rot.stop()
+                elif cmd == "K":
+                    name = "park:"
+                    rot.park()
+                elif cmd == "M":
+                    name = f"move: {args[0]} {args[1]}"
+                    rot.move(int(args[0]), int(args[1]))
+                elif cmd == "_":
+                    name, values = "get_info:", ["Info: Simulated rotator"]
+                else:
+                    name, code = f"{cmd}:", RIG_ENIMPL
+            except (ValueError, IndexError, KeyError):
+                values, code = [], RIG_EINVAL
+
+            if extended:
+                out = [name] + values + [f"RPRT {code}"]
+            elif values and code == 0:
+                out = [v.split(" ")[-1] for v in values]
+            else:
+                out = [f"RPRT {code}"]
+            self.wfile.write(("\n".join(out) + "\n").encode("utf-8"))
+
+
+class SimRotctld(socketserver.ThreadingTCPServer):
+    """
+    rotctld protocol server over a SimRotator, serving from a daemon thread.
+    'latency' is the delay in seconds added before each answer (serial line round trip).
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rotator=None, host="127.0.0.1", port=0, latency=0.0):
+        self.rotator = rotator or SimRotator()
+        self.latency = latency
+        super().__init__((host, port), SimRotctldHandler)
+        self.port = self.server_address[1]
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+def open_sim(latency=0.0, **params):
+    """
+    Start a simulated rotator and return a ROTCTLD connected to it (the server is rot.server).
+    'params' go to SimRotator (az_rate, el_rate, accel, az_limits, el_limits, park).
+    """
+    server = SimRotctld(SimRotator(**params), latency=latency)
+    rot = ROTCTLD("127.0.0.1", server.port)
+    rot.server = server
+    return rot
+
+
+if __name__ == "__main__":
+    server = SimRotctld(port=int(sys.argv[1]) if len(sys.argv) > 1 else 4533)
+    print(f"Simulated rotctld listening on 127.0.0.1:{server.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
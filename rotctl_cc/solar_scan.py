@@ -0,0 +1,217 @@
+import threading
+import time
+import numpy as np
+from .rotctl import tools
+
+# J2000.0 epoch (2000-01-01 12:00 UTC) in unix seconds
+J2000 = 946728000.0
+
+SCAN_DTYPE = np.dtype([("t", "f8"), ("az", "f8"), ("el", "f8"), ("d_az", "f8"), ("d_el", "f8")])
+
+
+def get_sun_positions(times, lat, lon):
+    """
+    Vectorized Sun position using standard physics formulas.
+    'times' are unix seconds, 'lat'/'lon' degrees; all three broadcast together
+    (e.g. lat[:, None] against times for several observers).
+    Returns (azimuth, elevation) arrays in degrees.
+    """
+    # Days since J2000.0
+    d = (np.asarray(times, dtype=np.float64) - J2000) / 86400.0
+
+    # Solar Mean Elements
+    g = np.radians(357.529 + 0.98560028 * d)
+    q = 280.459 + 0.98564736 * d
+    L = np.radians(q + 1.915 * np.sin(g) + 0.020 * np.sin(2 * g))
+    e = np.radians(23.439 - 0.00000036 * d)
+
+    # Convert to Rectangular/Celestial
+    sin_L = np.sin(L)
+    ra = np.arctan2(np.cos(e) * sin_L, np.cos(L))
+    dec = np.arcsin(np.sin(e) * sin_L)
+
+    # Sidereal Time for Local Longitude
+    gmst = (18.697374558 + 24.06570982441908 * d) % 24
+    ha = np.radians(gmst * 15 + np.asarray(lon, dtype=np.float64)) - ra
+
+    # Transform to Az/El
+    lat_r = np.radians(np.asarray(lat, dtype=np.float64))
+    sin_lat, cos_lat, cos_ha = np.sin(lat_r), np.cos(lat_r), np.cos(ha)
+    el = np.arcsin(sin_lat * np.sin(dec) + cos_lat * np.cos(dec) * cos_ha)
+    az = np.arctan2(-np.sin(ha), cos_lat * np.tan(dec) - sin_lat * cos_ha)
+
+    return np.degrees(az) % 360, np.degrees(el)
+
+
+def get_precise_sun(lat, lon):
+    """
+    Calculates Sun position now using standard physics formulas.
+    Returns (azimuth, elevation) as floats.
+    """
+    az, el = get_sun_positions(time.time(), lat, lon)
+    return round(float(az), 4), round(float(el), 4)
+
+
+def generate_float_scan(lat, lon, span=5.0, step=0.5, dwell=1.0, start=None):
+    """
+    Generates a high-precision 'Snake' scan pattern that follows the moving sun.
+    :param span: Total degrees to cover (e.g. 5.0 degree square)
+    :param step: Increment in float degrees (e.g. 0.5)
+    :param dwell: Seconds spent on each point, point k is due at start + k * dwell
+    :param start: Unix time of the first point (now by default)
+    Returns a SCAN_DTYPE array: time, target az/el and the (d_az, d_el) offset from the sun center.
+    """
+    # Integer count of steps keeps float stepping exact
+    steps_count = int(round(span / step))
+    offsets = np.round(-(span / 2) + np.arange(steps_count + 1) * step, 4)
+    n = len(offsets)
+
+    d_el = np.repeat(offsets, n)
+    # Reverse the azimuth direction every other row (Snake pattern)
+    d_az = np.tile(offsets, (n, 1))
+    d_az[1::2] = offsets[::-1]
+    d_az = d_az.ravel()
+
+    scan = np.empty(n * n, dtype=SCAN_DTYPE)
+    scan["t"] = (time.time() if start is None else start) + np.arange(n * n) * dwell
+    center_az, center_el = get_sun_positions(scan["t"], lat, lon)
+    scan["az"] = (center_az + d_az) % 360
+    scan["el"] = center_el + d_el
+    scan["d_az"] = d_az
+    scan["d_el"] = d_el
+    return scan
+
+
+class StubPowerSource:
+    """
+    Test power source: Gaussian beam of 'beam' degrees FWHM around the sun, peaking when the antenna
+    points at sun + 'offset' (az, el), on top of a 'sky' background with Gaussian 'noise'.
+    'pointing' is a callable returning the antenna (az, el), e.g. a SimRotator.get_pos.
+    """
+
+    def __init__(self, pointing, lat, lon, beam=2.0, offset=(0.3, -0.2), sky=0.1, noise=0.01, seed=None):
+        self.pointing = pointing
+        self.lat = lat
+        self.lon = lon
+        self.sigma = beam / 2.3548
+        self.offset = offset
+        self.sky = sky
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, t):
+        az, el = self.pointing()
+        sun_az, sun_el = get_sun_positions(t, self.lat, self.lon)
+        d_az = (az - sun_az + 180) % 360 - 180 - self.offset[0]
+        d_el = el - sun_el - self.offset[1]
+        beam = np.exp(-(d_az ** 2 + d_el ** 2) / (2 * self.sigma ** 2))
+        return float(self.sky + beam + self.rng.normal(0, self.noise))
+
+
+class ScanMap:
+    """
+    Beam map on the (d_el, d_az) offset grid: mean power per cell (NaN where nothing was measured).
+    """
+
+    def __init__(self, offsets, power, counts):
+        self.offsets = offsets
+        self.power = power
+        self.counts = counts
+
+    def fit_offset(self):
+        """
+        Pointing offset (d_az, d_el) of the beam peak: centroid of the cells above half maximum,
+        weighted by their power above the background (median of the map).
+        """
+        p = self.power - np.nanmedian(self.power)
+        peak = np.nanmax(p)
+        mask = np.nan_to_num(p, nan=0.0) >= peak / 2
+        w = np.where(mask, p, 0.0)
+        d_el, d_az = np.meshgrid(self.offsets, self.offsets, indexing="ij")
+        return float((w * d_az).sum() / w.sum()), float((w * d_el).sum() / w.sum())
+
+
+class ScanExecutor:
+    """
+    On-the-fly solar raster scan.
+    The raster points are sent to the rotator at a fixed dwell while a sampler thread reads the power
+    source and the measured position 'sample_rate' times per second; each sample is binned by its
+    measured offset from the moving sun into a preallocated grid. Motion and measurement overlap:
+    samples taken while slewing between points fill the map too.
+    'source' is a callable source(t) returning the power (or SNR) at unix time t.
+    """
+
+    def __init__(self, rot, source, lat, lon, span=4.0, step=0.25, dwell=1.0, sample_rate=20.0):
+        self.rot = rot
+        self.source = source
+        self.lat = lat
+        self.lon = lon
+        self.span = span
+        self.step = step
+        self.dwell = dwell
+        self.sample_rate = sample_rate
+        self.running = False
+
+    def run(self, start=None):
+        """
+        Run the scan (blocking) and return its ScanMap.
+        """
+        # Go to the first point (sun at the intended start) before the clock starts
+        first = generate_float_scan(self.lat, self.lon, self.span, self.step, self.dwell, start)[0]
+        self.rot.set_pos(round(float(first["az"]), 4), round(float(first["el"]), 4))
+
+        # Raster times count from the end of the slew, or from 'start' if it is still ahead
+        now = time.time()
+        scan = generate_float_scan(self.lat, self.lon, self.span, self.step, self.dwell,
+                                   now if start is None else max(start, now))
+        offsets = np.unique(scan["d_el"])
+        n = len(offsets)
+        sums = np.zeros((n, n))
+        counts = np.zeros((n, n), dtype=np.int64)
+
+        self.running = True
+        sampler = threading.Thread(target=self._sample, args=(sums, counts), daemon=True)
+        sampler.start()
+        try:
+            for t, az, el in zip(scan["t"].tolist(), scan["az"].tolist(), scan["el"].tolist()):
+                delay = t - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                self.rot.set_pos(round(az, 4), round(el, 4), wait=False)
+            time.sleep(self.dwell)
+        finally:
+            self.running = False
+            sampler.join()
+
+        with np.errstate(invalid="ignore"):
+            power = np.where(counts > 0, sums / counts, np.nan)
+        return ScanMap(offsets, power, counts)
+
+    def _sample(self, sums, counts):
+        n = sums.shape[0]
+        period = 1 / self.sample_rate
+        while self.running:
+            t = time.time()
+            power = self.source(t)
+            res = self.rot.get_pos(max_age=period / 2)
+            if not res:
+                time.sleep(period)
+                continue
+            az, el = tools.parse_pos(res)
+            sun_az, sun_el = get_sun_positions(t, self.lat, self.lon)
+            i = int(round((el - sun_el + self.span / 2) / self.step))
+            j = int(round(((az - sun_az + 180) % 360 - 180 + self.span / 2) / self.step))
+            if 0 <= i < n and 0 <= j < n:
+                sums[i, j] += power
+                counts[i, j] += 1
+            time.sleep(max(period - (time.time() - t), 0))
+
+
+if __name__ == "__main__":
+    # Example: 4x4 degree scan with 0.25 degree precision
+    path = generate_float_scan(48.68333, 2.13333, span=4.0, step=0.25)
+
+    print(f"{'Step':<5} | {'Time':<8} | {'Azimuth':<10} | {'Elevation':<10}")
+    print("-" * 41)
+    for idx, (t, az, el, d_az, d_el) in enumerate(path.tolist()):
+        print(f"{idx+1:<5} | {t - path['t'][0]:<8.1f} | {az:<10.4f} | {el:<10.4f}")
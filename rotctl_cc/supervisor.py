@@ -0,0 +1,226 @@
+""" Alexandre Hachet
+
+Supervision de la connexion au rotor.
+
+SupervisedRotator s'utilise comme un ROTCTL : chaque appel passe par la connexion courante.
+Quand le processus rotctl meurt, que la socket rotctld est coupée (câble), ou que le lien ne
+répond plus que par des erreurs d'E/S ou des timeouts (adaptateur USB réinitialisé, rotctl
+encore vivant), la connexion est rouverte en arrière-plan avec un délai croissant, puis la
+dernière consigne set_pos est renvoyée. Pendant la coupure les méthodes renvoient False au
+lieu de lever, et chaque changement d'état est signalé aux abonnés. Les statistiques, les
+hooks et la télémétrie appartiennent au superviseur et passent d'une connexion à l'autre.
+"""
+
+import threading
+import time
+import pexpect
+from .hamlib import HamlibIOError
+from .instrument import CommandStats
+from .rotctl import ROTCTL
+
+CONNECTED = "connected"
+DISCONNECTED = "disconnected"
+RECONNECTING = "reconnecting"
+CLOSED = "closed"
+
+# Errors of a link that is up but no longer reaches the rotator (HamlibTimeoutError is a TimeoutError)
+LINK_ERRORS = (HamlibIOError, TimeoutError, pexpect.TIMEOUT)
+
+
+class SupervisedRotator:
+    """
+    'factory' opens a connection (e.g. lambda: ROTCTLD("localhost", 4533)); it may raise.
+    Reconnect attempts wait min_backoff, doubling up to max_backoff seconds. An idle link is
+    checked with a get_pos every 'heartbeat' seconds. 'max_failures' consecutive I/O errors or
+    timeouts (LINK_ERRORS) count as a lost link even though the process or socket is still up.
+    on_state(state, error) is called on every state change (from the supervisor threads).
+    """
+
+    def __init__(self, factory, min_backoff=0.5, max_backoff=10.0, heartbeat=2.0, on_state=None, max_failures=3):
+        self.factory = factory
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.heartbeat = heartbeat
+        self.max_failures = max_failures
+        self.failures = 0
+        self.listeners = [on_state] if on_state is not None else []
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        # Current connection (None while disconnected) and the last one opened
+        self.rot = None
+        self.last_rot = None
+        self.state = None
+        self.last_error = None
+        # Last position commanded with set_pos, replayed after a reconnect (None after stop/park)
+        self.target = None
+        self.last_ok = time.monotonic()
+        self.reconnects = 0
+        self.outages = []
+        self.down_since = None
+        self.reconnecting = False
+        # Installed on every connection, so they outlive it
+        self.stats = CommandStats()
+        self.pre_hooks = []
+        self.post_hooks = []
+        self._telemetry = None
+
+        try:
+            self.rot = self.last_rot = self._adopt(factory())
+            self._set_state(CONNECTED)
+        except Exception as e:
+            self._lost(e)
+        threading.Thread(target=self._watch, daemon=True).start()
+
+    def add_listener(self, fn):
+        self.listeners.append(fn)
+
+    def _set_state(self, state, error=None):
+        if state == self.state:
+            return
+        self.state = state
+        for fn in self.listeners:
+            try:
+                fn(state, error)
+            except Exception as e:
+                print(f"State listener failed: {e}")
+
+    def _adopt(self, rot):
+        rot.stats, rot.pre_hooks, rot.post_hooks = self.stats, self.pre_hooks, self.post_hooks
+        rot.telemetry = self._telemetry
+        return rot
+
+    @property
+    def telemetry(self):
+        return self._telemetry
+
+    @telemetry.setter
+    def telemetry(self, recorder):
+        self._telemetry = recorder
+        if self.rot is not None:
+            self.rot.telemetry = recorder
+
+    def add_hook(self, pre=None, post=None):
+        if pre is not None:
+            self.pre_hooks.append(pre)
+        if post is not None:
+            self.post_hooks.append(post)
+
+    def serve_metrics(self, host="127.0.0.1", port=9108):
+        from .metrics import MetricsServer
+        return MetricsServer(self.stats, host, port)
+
+    def __getattr__(self, name):
+        # ROTCTL methods and attributes of the connection (the last one while disconnected)
+        rot = self.__dict__.get("last_rot")
+        if rot is None:
+            # Never connected yet: ROTCTL methods return False like during any outage
+            if not name.startswith("_") and callable(getattr(ROTCTL, name, None)):
+                return lambda *args, **kwargs: self._invoke(name, *args, **kwargs)
+            raise AttributeError(name)
+        attr = getattr(rot, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: self._invoke(name, *args, **kwargs)
+
+    def _invoke(self, name, *args, **kwargs):
+        rot = self.rot
+        if rot is None or self.state != CONNECTED:
+            return False
+        try:
+            out = getattr(rot, name)(*args, **kwargs)
+        except Exception as e:
+            if rot.is_alive():
+                self._failed(e)
+                raise
+            self._lost(e)
+            return False
+        if out is False and not rot.is_alive():
+            self._lost(rot.last_error)
+        elif out is False:
+            self._failed(rot.last_error)
+        else:
+            self.failures = 0
+            self.last_ok = time.monotonic()
+        return out
+
+    def _failed(self, error):
+        # The rotator answered with an error: only repeated link errors mean the link is gone
+        if not isinstance(error, LINK_ERRORS):
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            self._lost(error)
+
+    def set_pos(self, az, el, timeout=None, wait=True):
+        self.target = (az, el)
+        return self._invoke("set_pos", az, el, timeout, wait)
+
+    def stop(self):
+        self.target = None
+        return self._invoke("stop")
+
+    def park(self):
+        self.target = None
+        return self._invoke("park")
+
+    def _lost(self, error):
+        with self.lock:
+            self.last_error = error
+            if self.closed.is_set() or self.reconnecting:
+                return
+            self.reconnecting = True
+            if self.down_since is None:
+                self.down_since = time.monotonic()
+        self._set_state(DISCONNECTED, error)
+        threading.Thread(target=self._reconnect, daemon=True).start()
+
+    def _reconnect(self):
+        delay = self.min_backoff
+        old, self.rot = self.last_rot, None
+        if old is not None:
+            try:
+                old.exit()
+            except Exception:
+                pass
+
+        while not self.closed.is_set():
+            self._set_state(RECONNECTING, self.last_error)
+            try:
+                rot = self.factory()
+            except Exception as e:
+                self.last_error = e
+                self.closed.wait(delay)
+                delay = min(2 * delay, self.max_backoff)
+                continue
+
+            self._adopt(rot)
+            if self.target is not None:
+                rot.set_pos(*self.target, wait=False)
+            self.rot = self.last_rot = rot
+            self.failures = 0
+            self.reconnects += 1
+            self.outages.append(time.monotonic() - self.down_since)
+            self.down_since = None
+            self.last_ok = time.monotonic()
+            with self.lock:
+                self.reconnecting = False
+            self._set_state(CONNECTED)
+            return
+
+    def _watch(self):
+        while not self.closed.wait(self.heartbeat / 2):
+            rot = self.rot
+            if rot is None or self.state != CONNECTED:
+                continue
+            if not rot.is_alive():
+                self._lost(rot.last_error)
+            elif time.monotonic() - self.last_ok > self.heartbeat:
+                self._invoke("get_pos")
+
+    def exit(self):
+        self.closed.set()
+        rot, self.rot = self.rot, None
+        if rot is not None:
+            rot.exit()
+        self._set_state(CLOSED)
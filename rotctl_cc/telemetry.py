@@ -0,0 +1,124 @@
+""" Alexandre Hachet
+
+Enregistrement de télémétrie du rotor.
+
+Chaque commande envoyée (lettre, latence), chaque position cible et chaque position mesurée
+est écrite dans un tampon circulaire préalloué (une colonne NumPy par champ, aucun objet par
+échantillon). Un thread d'arrière-plan vide le tampon par blocs dans des fichiers colonnes
+NPZ (ou Parquet si pyarrow est installé), sans bloquer la boucle de contrôle.
+"""
+
+import math
+import os
+import threading
+import time
+import numpy as np
+
+COLUMNS = (("t", "f8"), ("cmd", "u1"), ("latency", "f4"),
+           ("target_az", "f4"), ("target_el", "f4"), ("az", "f4"), ("el", "f4"))
+
+
+class TelemetryRecorder:
+
+    def __init__(self, path="telemetry", capacity=1 << 16, flush_interval=10.0, fmt="npz"):
+        """
+        Chunks are written to '<path>-000001.npz' (or .parquet with fmt="parquet").
+        When the writer falls behind by more than 'capacity' samples the oldest ones are dropped.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.fmt = fmt
+        self.cols = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS}
+        self.lock = threading.Lock()
+        self.written = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.chunk = 0
+        self.wake = threading.Event()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record(self, cmd, latency=math.nan, target=(math.nan, math.nan), pos=(math.nan, math.nan), t=None):
+        """
+        Store one sample. 'cmd' is the command letter ("p", "P", "S"...) or "T" for a tracker target.
+        """
+        with self.lock:
+            i = self.written % self.capacity
+            c = self.cols
+            c["t"][i] = time.time() if t is None else t
+            c["cmd"][i] = ord(cmd[0])
+            c["latency"][i] = latency
+            c["target_az"][i] = target[0]
+            c["target_el"][i] = target[1]
+            c["az"][i] = pos[0]
+            c["el"][i] = pos[1]
+            self.written += 1
+            if self.written - self.flushed > self.capacity:
+                self.dropped += self.written - self.flushed - self.capacity
+                self.flushed = self.written - self.capacity
+            if self.written - self.flushed >= self.capacity // 2:
+                self.wake.set()
+
+    def snapshot(self):
+        """
+        Copy of the samples not yet flushed, as a dict of columns.
+        """
+        with self.lock:
+            return self._take(self.flushed, self.written)
+
+    def _take(self, start, stop):
+        idx = np.arange(start, stop) % self.capacity
+        return {name: col[idx] for name, col in self.cols.items()}
+
+    def flush(self):
+        with self.lock:
+            start, stop = self.flushed, self.written
+            if stop == start:
+                return None
+            data = self._take(start, stop)
+            self.flushed = stop
+            self.chunk += 1
+            chunk = self.chunk
+        return self._write(data, chunk)
+
+    def _write(self, data, chunk):
+        if self.fmt == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Parquet telemetry needs pyarrow: pip install pyarrow")
+            out = f"{self.path}-{chunk:06d}.parquet"
+            pq.write_table(pa.table(data), out)
+        else:
+            out = f"{self.path}-{chunk:06d}.npz"
+            np.savez(out, **data)
+        return out
+
+    def _run(self):
+        while self.running:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Telemetry flush failed: {e}")
+
+    def close(self):
+        self.running = False
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+
+
+def load(path):
+    """
+    Concatenate every NPZ chunk written under 'path' into one dict of columns.
+    """
+    folder = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "-"
+    files = sorted(f for f in os.listdir(folder) if f.startswith(prefix) and f.endswith(".npz"))
+    chunks = [np.load(os.path.join(folder, f)) for f in files]
+    return {name: np.concatenate([c[name] for c in chunks]) for name, _ in COLUMNS} if chunks else {}
@@ -0,0 +1,178 @@
+"""
+Satellite tracking script using TLE orbit parameters.
+Moves the antenna to follow the satellite using rotctl.
+
+The whole pass (AOS/TCA/LOS and a dense az/el trajectory) is computed in one vectorized
+Skyfield call, the tracking loop then only interpolates in the precomputed arrays.
+"""
+
+import time
+import numpy as np
+from datetime import datetime, timezone
+from skyfield.api import Topos, load, EarthSatellite
+from .rotctl import ROTCTL, tools
+
+OBSERVER_LAT = 48.68333
+OBSERVER_LON = 2.13333
+OBSERVER_ELEV = 0
+
+TLE_LINE_1 = "1 25544U 98067A   24001.00000000  .00000000  00000-0  00000-0 0  9999"
+TLE_LINE_2 = "2 25544  51.6400  10.0000 0002000   0.0000  0.0000 15.50000000    01"
+
+
+class Pass:
+    """
+    One pass of a satellite over the observer.
+    'aos', 'tca' and 'los' are unix timestamps, 't', 'az' and 'el' the sampled trajectory.
+    Azimuth is stored unwrapped so interpolation across north (359 -> 0) stays continuous.
+    """
+
+    def __init__(self, aos, tca, los, t, az, el):
+        self.aos = aos
+        self.tca = tca
+        self.los = los
+        self.t = t
+        self.az = az
+        self.el = el
+
+    @property
+    def max_el(self):
+        return float(self.el.max())
+
+    def position(self, when):
+        """
+        Interpolated (azimuth, elevation) at unix time 'when' (scalar or array).
+        """
+        az = np.interp(when, self.t, self.az) % 360
+        el = np.interp(when, self.t, self.el)
+        return az, el
+
+    def __str__(self):
+        fmt = lambda t: datetime.fromtimestamp(t, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        return f"AOS {fmt(self.aos)}  TCA {fmt(self.tca)}  LOS {fmt(self.los)}  max el {self.max_el:.1f}°"
+
+
+class PassPredictor:
+
+    def __init__(self, satellite, observer, ts=None, step=1.0, min_el=0.0):
+        """
+        'step' is the trajectory sampling period in seconds, 'min_el' the horizon in degrees.
+        """
+        self.satellite = satellite
+        self.observer = observer
+        self.ts = ts or load.timescale()
+        self.step = step
+        self.min_el = min_el
+        self.difference = satellite - observer
+
+    def passes(self, start=None, hours=24):
+        """
+        All passes starting within 'hours' from 'start' (datetime, now by default).
+        A pass already in progress at 'start' begins at 'start'.
+        """
+        t0 = self.ts.now() if start is None else self.ts.from_datetime(start)
+        t1 = t0 + hours / 24
+        times, events = self.satellite.find_events(self.observer, t0, t1, altitude_degrees=self.min_el)
+
+        out = []
+        aos = tca = None
+        if len(events) and events[0] != 0:
+            aos = t0
+        for t, event in zip(times, events):
+            if event == 0:
+                aos, tca = t, None
+            elif event == 1 and aos is not None:
+                tca = t
+            elif event == 2 and aos is not None:
+                out.append(self.sample(aos, aos if tca is None else tca, t))
+                aos = None
+        return out
+
+    def next_pass(self, start=None, hours=24):
+        passes = self.passes(start, hours)
+        return passes[0] if passes else None
+
+    def sample(self, aos, tca, los):
+        """
+        Dense trajectory between the skyfield Times aos and los, returned as a Pass.
+        """
+        n = max(int((los.tt - aos.tt) * 86400 / self.step) + 1, 2)
+        jd = np.linspace(aos.tt, los.tt, n)
+        alt, az, _ = self.difference.at(self.ts.tt_jd(jd)).altaz()
+
+        aos_unix = aos.utc_datetime().timestamp()
+        t = aos_unix + (jd - jd[0]) * 86400
+        tca_unix = aos_unix + (tca.tt - aos.tt) * 86400
+        return Pass(aos_unix, tca_unix, t[-1], t, np.degrees(np.unwrap(az.radians)), alt.degrees)
+
+
+def track_pass(rot, p, period=1.0, planner=None):
+    """
+    Pre-position on the AOS point, wait for the satellite and follow it until LOS.
+    With a planner.Planner the pass is flown from its plan (lead, azimuth turn, flip) instead of
+    sending the interpolated position every 'period' seconds.
+    """
+    if planner is not None:
+        pos = rot.get_pos()
+        # Position unknown (link down): plan the azimuth turn from 0
+        current_az = tools.parse_pos(pos)[0] if pos is not False else 0.0
+        plan = planner.plan(p.t, p.az, p.el, current_az)
+        rot.set_pos(plan.az[0], plan.el[0])
+        plan.execute(rot, planner.model)
+        return
+
+    rot.set_pos(*p.position(p.aos))
+    time.sleep(max(p.aos - time.time(), 0))
+
+    while time.time() < p.los:
+        azimuth, elevation = p.position(time.time())
+        print(f"Azimuth: {azimuth:.1f}, Elevation: {elevation:.1f}")
+        rot.set_pos(azimuth, elevation, wait=False)
+        time.sleep(period)
+
+
+def tle_track(rot, TLE_LINE_1, TLE_LINE_2, period=1.0, planner=None):
+    """
+    Follow the satellite pass after pass, sending one position every 'period' seconds.
+    """
+    ts = load.timescale()
+    satellite = EarthSatellite(TLE_LINE_1, TLE_LINE_2, name="Satellite", ts=ts)
+    track_satellite(rot, satellite, ts, period, planner)
+
+
+def track_satellite(rot, satellite, ts=None, period=1.0, planner=None):
+    """
+    tle_track for an EarthSatellite (e.g. from a TLEStore catalogue).
+    """
+    ts = ts or load.timescale()
+    observer = Topos(latitude_degrees=OBSERVER_LAT,
+                     longitude_degrees=OBSERVER_LON,
+                     elevation_m=OBSERVER_ELEV)
+
+    predictor = PassPredictor(satellite, observer, ts)
+
+    try:
+        while True:
+            p = predictor.next_pass()
+            if p is None:
+                print("No pass in the next 24 h.")
+                time.sleep(3600)
+                continue
+            print(f"Next pass: {p}")
+
+            track_pass(rot, p, period, planner)
+
+    except KeyboardInterrupt:
+        print("\nStopping tracking...")
+        rot.stop()
+        rot.exit()
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 2:
+        # python -m rotctl_cc.tle_follow CATALOGUE NORAD|NAME
+        from .tle_store import TLEStore
+        store = TLEStore.load([sys.argv[1]])
+        track_satellite(ROTCTL(), store.satellite(sys.argv[2]), store.ts)
+    else:
+        tle_track(ROTCTL(), TLE_LINE_1, TLE_LINE_2)
@@ -0,0 +1,206 @@
+""" Alexandre Hachet
+
+Catalogue de satellites à partir de fichiers TLE (2 ou 3 lignes) ou OMM (CSV, XML, JSON).
+
+Les fichiers sont lus une seule fois : les éléments orbitaux (un enregistrement par numéro
+NORAD, l'époque la plus récente) sont rangés dans un tableau NumPy trié par NORAD et gardés
+dans un cache .npz avec la liste des fichiers sources (chemin, taille, date). Au démarrage
+suivant le cache est rechargé tel quel si cette liste n'a pas changé. Les objets EarthSatellite ne sont construits qu'à la demande, par
+NORAD ou par nom, et l'âge des éléments est vérifié à ce moment.
+"""
+
+import json
+import os
+import time
+import numpy as np
+
+ELEMENTS_DTYPE = np.dtype([
+    ("norad", "<i4"), ("name", "<U24"),
+    # SGP4 epoch: days since 1949-12-31 00:00 UT
+    ("epoch", "<f8"),
+    # sgp4init units: 1/earth radii, rad/min², rad/min³, -, rad, rad, rad, rad/min, rad
+    ("bstar", "<f8"), ("ndot", "<f8"), ("nddot", "<f8"), ("ecco", "<f8"), ("argpo", "<f8"),
+    ("inclo", "<f8"), ("mo", "<f8"), ("no_kozai", "<f8"), ("nodeo", "<f8"),
+])
+
+# Source files a cache was built from
+SOURCES_DTYPE = np.dtype([("path", "<U1024"), ("size", "<i8"), ("mtime", "<f8")])
+
+# 1949-12-31 00:00 UT in unix seconds
+SGP4_EPOCH0 = -631238400.0
+
+# Elements older than this (days) are reported as stale
+STALE_DAYS = 14
+
+
+def read_tle(path):
+    """
+    (name, line1, line2) for every element set of a 2 or 3 line TLE file ('0 NAME' lines accepted).
+    """
+    name = None
+    with open(path, "r") as f:
+        lines = iter(line.rstrip() for line in f)
+        for line in lines:
+            if line.startswith("1 "):
+                line2 = next(lines, "")
+                if line2.startswith("2 "):
+                    yield name, line, line2
+                name = None
+            elif line.strip():
+                name = line[2:].strip() if line.startswith("0 ") else line.strip()
+
+
+def read_omm(path):
+    """
+    OMM field dicts of a CSV, XML or JSON file (CelesTrak / Space-Track keys).
+    """
+    from sgp4 import omm
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            data = json.load(f)
+        yield from (data if isinstance(data, list) else [data])
+    elif path.endswith(".xml"):
+        with open(path, "r") as f:
+            yield from omm.parse_xml(f)
+    else:
+        with open(path, "r") as f:
+            yield from omm.parse_csv(f)
+
+
+def _satrecs(path):
+    # (name, Satrec) for every object of a TLE or OMM file
+    from sgp4 import omm
+    from sgp4.api import Satrec
+    if path.endswith((".csv", ".xml", ".json")):
+        for fields in read_omm(path):
+            sat = Satrec()
+            omm.initialize(sat, fields)
+            yield fields.get("OBJECT_NAME"), sat
+    else:
+        for name, line1, line2 in read_tle(path):
+            yield name, Satrec.twoline2rv(line1, line2)
+
+
+def ingest(paths):
+    """
+    ELEMENTS_DTYPE array of the objects in 'paths', one row per NORAD ID (most recent epoch), sorted.
+    """
+    rows = []
+    for path in paths:
+        for name, sat in _satrecs(path):
+            rows.append((sat.satnum, (name or str(sat.satnum))[:24], sat.jdsatepoch - 2433281.5 + sat.jdsatepochF,
+                         sat.bstar, sat.ndot, sat.nddot, sat.ecco, sat.argpo, sat.inclo, sat.mo, sat.no_kozai,
+                         sat.nodeo))
+    elements = np.array(rows, dtype=ELEMENTS_DTYPE)
+    if len(elements) == 0:
+        return elements
+    # Latest epoch per NORAD: sort by (norad, epoch) and keep the last row of each NORAD
+    elements = elements[np.lexsort((elements["epoch"], elements["norad"]))]
+    last = np.append(elements["norad"][1:] != elements["norad"][:-1], True)
+    return elements[last]
+
+
+class TLEStore:
+    """
+    Satellite catalogue over an ELEMENTS_DTYPE array.
+    Keys are NORAD IDs (int or digit string) or names (case insensitive).
+    """
+
+    def __init__(self, elements, ts=None):
+        self.elements = elements
+        # Contiguous copy: searchsorted on the strided field view would copy it on every lookup
+        self.norads = np.ascontiguousarray(elements["norad"])
+        self.ts = ts
+        self.names = None
+        self.satellites = {}
+
+    @classmethod
+    def load(cls, sources, cache="tle_cache.npz", ts=None):
+        """
+        Store for the TLE/OMM files 'sources', read from 'cache' when it was built from the same
+        files (path, size, mtime), rebuilt and saved otherwise. cache=None always parses the sources.
+        """
+        stamp = np.array([(os.path.abspath(path), os.path.getsize(path), os.path.getmtime(path))
+                          for path in sources], dtype=SOURCES_DTYPE)
+        if cache is not None and os.path.exists(cache):
+            try:
+                with np.load(cache) as data:
+                    if np.array_equal(data["sources"], stamp):
+                        return cls(data["elements"], ts)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Ignoring TLE cache {cache}: {e}")
+        elements = ingest(sources)
+        if cache is not None:
+            # Through a file object: np.savez would append .npz to another extension
+            with open(cache, "wb") as f:
+                np.savez(f, elements=elements, sources=stamp)
+        return cls(elements, ts)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __contains__(self, key):
+        try:
+            self.index(key)
+            return True
+        except KeyError:
+            return False
+
+    def index(self, key):
+        """
+        Row of 'key' in self.elements, KeyError if unknown.
+        """
+        if isinstance(key, str) and not key.strip().isdigit():
+            if self.names is None:
+                self.names = {name.upper(): i for i, name in enumerate(self.elements["name"].tolist())}
+            i = self.names.get(key.strip().upper())
+            if i is None:
+                raise KeyError(key)
+            return i
+        # Same dtype as the array, a Python int makes searchsorted cast the whole array
+        norad = self.norads.dtype.type(int(key))
+        i = int(self.norads.searchsorted(norad))
+        if i == len(self.norads) or self.norads[i] != norad:
+            raise KeyError(key)
+        return i
+
+    def epoch(self, key):
+        """
+        Epoch of the elements in unix seconds.
+        """
+        return SGP4_EPOCH0 + float(self.elements["epoch"][self.index(key)]) * 86400
+
+    def age_days(self, key, now=None):
+        return ((time.time() if now is None else now) - self.epoch(key)) / 86400
+
+    def stale(self, max_age=STALE_DAYS, now=None):
+        """
+        NORAD IDs whose elements are older than 'max_age' days.
+        """
+        now = time.time() if now is None else now
+        age = (now - SGP4_EPOCH0) / 86400 - self.elements["epoch"]
+        return self.norads[age > max_age]
+
+    def satellite(self, key, max_age=STALE_DAYS):
+        """
+        EarthSatellite for 'key', built on first use from the stored elements.
+        Prints a warning when it is built from elements older than 'max_age' days.
+        """
+        i = self.index(key)
+        sat = self.satellites.get(i)
+        if sat is None:
+            from sgp4.api import Satrec, WGS72
+            from skyfield.api import EarthSatellite, load
+            if self.ts is None:
+                self.ts = load.timescale()
+            e = self.elements[i]
+            rec = Satrec()
+            rec.sgp4init(WGS72, "i", int(e["norad"]), float(e["epoch"]), float(e["bstar"]), float(e["ndot"]),
+                         float(e["nddot"]), float(e["ecco"]), float(e["argpo"]), float(e["inclo"]), float(e["mo"]),
+                         float(e["no_kozai"]), float(e["nodeo"]))
+            sat = self.satellites[i] = EarthSatellite.from_satrec(rec, self.ts)
+            sat.name = str(e["name"])
+            age = self.age_days(int(e["norad"]))
+            if age > max_age:
+                print(f"Elements of {sat.name} ({int(e['norad'])}) are {age:.1f} days old.")
+        return sat
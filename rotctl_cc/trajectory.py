@@ -0,0 +1,97 @@
+""" Alexandre Hachet
+
+Lecture de trajectoires (temps, azimuth, élévation) sans tout charger en mémoire.
+
+Deux formats :
+- texte tabulé "temps\\tazimuth\\télévation" (temps en secondes unix ou date ISO), lu en flux par blocs ;
+- binaire compact .trj : triplets float64 little-endian (t, az, el) sans en-tête, ouvert en memmap.
+"""
+
+import os
+import numpy as np
+from datetime import datetime, timezone
+
+TRAJ_DTYPE = np.dtype([("t", "<f8"), ("az", "<f8"), ("el", "<f8")])
+BINARY_EXT = ".trj"
+
+
+def parse_time(s):
+    """
+    Unix seconds from a float string or an ISO 8601 date (naive dates are UTC).
+    """
+    try:
+        return float(s)
+    except ValueError:
+        d = datetime.fromisoformat(s.strip())
+        if d.tzinfo is None:
+            d = d.replace(tzinfo=timezone.utc)
+        return d.timestamp()
+
+
+class Trajectory:
+    """
+    Lazy trajectory file. Iterating yields (t, az, el) floats, chunks() yields TRAJ_DTYPE arrays.
+    Text files are parsed 'chunk' lines at a time, binary files are memory-mapped.
+    """
+
+    def __init__(self, path, chunk=4096):
+        self.path = path
+        self.chunk = chunk
+        self.binary = path.endswith(BINARY_EXT)
+
+    def __len__(self):
+        if self.binary:
+            return os.path.getsize(self.path) // TRAJ_DTYPE.itemsize
+        with open(self.path, "r") as f:
+            return sum(1 for line in f if line.strip())
+
+    def memmap(self):
+        return np.memmap(self.path, dtype=TRAJ_DTYPE, mode="r")
+
+    def chunks(self):
+        if self.binary:
+            data = self.memmap()
+            for i in range(0, len(data), self.chunk):
+                yield data[i:i + self.chunk]
+            return
+
+        rows = []
+        with open(self.path, "r") as f:
+            for line in f:
+                data = line.split("\t")
+                if len(data) < 3:
+                    continue
+                rows.append((parse_time(data[0]), float(data[1]), float(data[2])))
+                if len(rows) == self.chunk:
+                    yield np.array(rows, dtype=TRAJ_DTYPE)
+                    rows = []
+        if rows:
+            yield np.array(rows, dtype=TRAJ_DTYPE)
+
+    def __iter__(self):
+        for block in self.chunks():
+            for t, az, el in block.tolist():
+                yield t, az, el
+
+    def to_binary(self, dst):
+        """
+        Convert to the .trj format chunk by chunk, in constant memory.
+        """
+        with open(dst, "wb") as f:
+            for block in self.chunks():
+                f.write(block.tobytes())
+        return Trajectory(dst, self.chunk)
+
+
+def iter_points(source):
+    """
+    (t, az, el) points from a file path, a Trajectory, a TRAJ_DTYPE array or the legacy (T, AZ, EL) lists.
+    """
+    if isinstance(source, str):
+        source = Trajectory(source)
+    if isinstance(source, Trajectory):
+        return iter(source)
+    if isinstance(source, np.ndarray):
+        return iter(source.tolist())
+    T, AZ, EL = source
+    return ((parse_time(t) if isinstance(t, str) else t, az, el) for t, az, el in zip(T, AZ, EL))
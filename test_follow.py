@@ -1,8 +1,6 @@
-from follow import *
-from rotctl import *
-import numpy as np
-import matplotlib.pyplot as plt
-from tqdm import tqdm
+from rotctl_cc.follow import *
+from rotctl_cc.rotctl import *
+from rotctl_cc.get_noaa import SatelliteTracker
 
 rot = ROTCTL()
 fol = Follow(rot)
@@ -12,17 +10,22 @@ TARGET_EL, TARGET_AZ = [], []
 
 fol._follow()
 print("Sarting to follow satellite...")
+from tqdm import tqdm
 for i in tqdm(range(3), desc="Processing", unit="step"):
     pos = tools.parse_pos(rot.get_pos())
     AZ.append(pos[0])
     EL.append(pos[1])
 
     target = SatelliteTracker.getPos()
-    TARGET_AZ.append(float(target["azimuth"])); TARGET_EL.append(float(target["elevation"]))
+    TARGET_AZ.append(target["azimuth"]); TARGET_EL.append(target["elevation"])
     time.sleep(1)
 fol._unflollow()
 print("Stopped following satellite.")
 
+# Plotting libraries are only loaded once the rotator work is done
+import numpy as np
+import matplotlib.pyplot as plt
+
 ax = plt.subplot(1, 1, 1, projection='polar')
 ax.plot(np.deg2rad(AZ), 90-np.array(EL), "-", label="Antenna")
 ax.plot(np.deg2rad(TARGET_AZ), 90-np.array(TARGET_EL), "x", label="Target")
@@ -0,0 +1,49 @@
+""" Alexandre Hachet
+
+locator.py contre les valeurs documentées de Hamlib (rotctl L, l, B, A).
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rotctl_cc import locator
+
+
+def test_lonlat2loc():
+    # rotctl: L -170 -85 12
+    assert locator.lonlat2loc(-170.0, -85.0, 12) == "AA55AA00AA00"
+
+
+def test_loc2lonlat():
+    # rotctl: l AA55AA00AA00
+    lon, lat = locator.loc2lonlat("AA55AA00AA00")
+    assert lon == pytest.approx(-169.999983, abs=1e-6)
+    assert lat == pytest.approx(-84.999991, abs=1e-6)
+
+
+def test_loc2lonlat_mixed_lengths():
+    locs = np.array(["JN18", "JN18du", "AA55AA00AA00"])
+    lon, lat = locator.loc2lonlat(locs)
+    # Center of the last square given
+    assert lon[0] == pytest.approx(3.0) and lat[0] == pytest.approx(48.5)
+    assert lon[1] == pytest.approx(2.291667, abs=1e-6) and lat[1] == pytest.approx(48.854167, abs=1e-6)
+    for i, loc in enumerate(locs):
+        assert (lon[i], lat[i]) == pytest.approx(locator.loc2lonlat(str(loc)))
+
+
+def test_qrb_coincident():
+    assert locator.qrb(2.13333, 48.68333, 2.13333, 48.68333) == (0.0, 0.0)
+
+
+def test_qrb_antipodal():
+    assert locator.qrb(10.0, 20.0, -170.0, -20.0) == (pytest.approx(180 * locator.ARC_IN_KM), 0.0)
+
+
+def test_a_sp2a_lp():
+    # rotctl: A 0, A 180, A 360 (ROTCTL.a_sp2a_lp)
+    assert locator.azimuth_long_path(0.0) == 180.0
+    assert locator.azimuth_long_path(180.0) == 0.0
+    assert locator.azimuth_long_path(360.0) == 180.0
+    with pytest.raises(ValueError):
+        locator.azimuth_long_path(-1.0)
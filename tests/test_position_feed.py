@@ -0,0 +1,80 @@
+""" Alexandre Hachet
+
+PositionFeed contre un serveur HTTP local qui sert bench_data/n2yo_sample.json.
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("requests")
+
+from rotctl_cc.get_noaa import PositionFeed
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_data", "n2yo_sample.json")
+
+
+@pytest.fixture
+def n2yo():
+    """
+    Stub n2yo server: yields (url, list of the requested paths).
+    """
+    with open(SAMPLE, "rb") as f:
+        body = f.read()
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/sat/instant-tracking.php?s=29155", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def sample_rows():
+    # (t, el, az) of the first two positions of the sample
+    with open(SAMPLE) as f:
+        pos = json.load(f)[0]["pos"]
+    rows = []
+    for p in pos[:2]:
+        fields = p["d"].split("|")
+        rows.append((int(fields[9]), float(fields[3]), float(fields[4])))
+    return rows
+
+
+def test_position_is_interpolated(n2yo):
+    url, _ = n2yo
+    (t0, el0, az0), (t1, el1, az1) = sample_rows()
+    feed = PositionFeed(url)
+
+    pos = feed.position((t0 + t1) / 2)
+
+    assert pos["elevation"] == pytest.approx((el0 + el1) / 2)
+    assert pos["azimuth"] == pytest.approx((az0 + az1) / 2)
+
+
+def test_repeated_positions_fetch_once(n2yo):
+    url, seen = n2yo
+    (t0, _, _), _ = sample_rows()
+    feed = PositionFeed(url)
+
+    for k in range(20):
+        assert feed.position(t0 + k * 0.5) is not None
+
+    assert len(seen) == 1
+    assert seen[0].startswith("/sat/instant-tracking.php")